@@ -1,6 +1,12 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class ApiConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "api"
+
+    def ready(self):
+        from .utils.token_accounting import prewarm_encodings
+
+        prewarm_encodings(settings.TOKEN_ACCOUNTING["PREWARM_MODELS"])
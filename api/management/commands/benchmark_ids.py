@@ -0,0 +1,155 @@
+import random
+import time
+import uuid
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from ...models import MindMap, Node
+from ...services import MindMapProjectData
+from ...utils.flow_data import flow_data_columns
+from ...utils.uuid7 import uuid7
+
+GENERATORS = {"uuid4": uuid.uuid4, "uuid7": uuid7}
+
+# Id column layouts compared side by side in temporary tables: the text
+# column used before the ids were migrated and the binary one used after.
+COLUMN_TYPES = {
+    "text": ("varchar(36)", str),
+    "binary": ("binary(16)", lambda value: value.bytes),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark bulk node inserts and full map loads with random and "
+        "time-ordered ids on the current schema, then compare text and binary "
+        "id columns side by side in temporary tables. Run it against MySQL for "
+        "numbers that matter; everything it writes is rolled back or dropped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+        parser.add_argument("--repeat", type=int, default=3)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument(
+            "--generators", nargs="+", choices=GENERATORS, default=list(GENERATORS)
+        )
+        parser.add_argument(
+            "--column-types",
+            nargs="+",
+            choices=COLUMN_TYPES,
+            default=list(COLUMN_TYPES),
+        )
+
+    def handle(self, *args, **options):
+        for size in options["sizes"]:
+            for name in options["generators"]:
+                inserts = []
+                loads = []
+                for _ in range(options["repeat"]):
+                    insert, load = self._run_once(
+                        size, GENERATORS[name], options["seed"]
+                    )
+                    inserts.append(insert)
+                    loads.append(load)
+                self._report(size, name, inserts, loads)
+
+        for size in options["sizes"]:
+            for column_type in options["column_types"]:
+                for name in options["generators"]:
+                    inserts = []
+                    loads = []
+                    for _ in range(options["repeat"]):
+                        insert, load = self._run_column_once(
+                            size, GENERATORS[name], options["seed"], column_type
+                        )
+                        inserts.append(insert)
+                        loads.append(load)
+                    self._report(size, f"{name} {column_type}", inserts, loads)
+
+    def _report(self, size, label, inserts, loads):
+        self.stdout.write(
+            f"{size:>7} nodes  {label:<12} "
+            f"insert best {min(inserts) * 1000:10.2f} ms  "
+            f"load best {min(loads) * 1000:10.2f} ms"
+        )
+
+    @staticmethod
+    def _run_once(size, generate_id, seed):
+        rng = random.Random(seed)
+        with transaction.atomic():
+            user = User.objects.create(username=f"benchmark-{uuid.uuid4()}")
+            mind_map = MindMap.objects.create(user=user, title="Benchmark")
+            ids = [str(generate_id()) for _ in range(size)]
+            nodes = []
+            for index, node_id in enumerate(ids):
+                flow_data = {
+                    "id": node_id,
+                    "type": "mindmap",
+                    "data": {"label": f"Node {index}"},
+                    "position": {"x": rng.uniform(-5000, 5000), "y": index * 40},
+                }
+                nodes.append(
+                    Node(
+                        id=node_id,
+                        mind_map=mind_map,
+                        parent_id=ids[rng.randrange(index)] if index else None,
+                        title=f"Node {index}",
+                        flow_data=flow_data,
+                        **flow_data_columns(flow_data),
+                    )
+                )
+
+            started = time.perf_counter()
+            Node.objects.bulk_create(nodes, batch_size=1000)
+            insert = time.perf_counter() - started
+
+            started = time.perf_counter()
+            "".join(MindMapProjectData.iter_json(mind_map))
+            load = time.perf_counter() - started
+
+            transaction.set_rollback(True)
+        return insert, load
+
+    @staticmethod
+    def _run_column_once(size, generate_id, seed, column_type):
+        db_type, to_db = COLUMN_TYPES[column_type]
+        rng = random.Random(seed)
+        ids = [generate_id() for _ in range(size)]
+        rows = [
+            (
+                to_db(node_id),
+                to_db(ids[rng.randrange(index)]) if index else None,
+                f"Node {index}",
+            )
+            for index, node_id in enumerate(ids)
+        ]
+        table = connection.ops.quote_name(f"benchmark_ids_{column_type}")
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE TEMPORARY TABLE {table} ("
+                f"id {db_type} NOT NULL PRIMARY KEY, "
+                f"parent_id {db_type} NULL, "
+                "label varchar(255) NOT NULL)"
+            )
+            try:
+                started = time.perf_counter()
+                with transaction.atomic():
+                    for start in range(0, size, 1000):
+                        cursor.executemany(
+                            f"INSERT INTO {table} (id, parent_id, label) "
+                            "VALUES (%s, %s, %s)",
+                            rows[start : start + 1000],
+                        )
+                insert = time.perf_counter() - started
+
+                started = time.perf_counter()
+                cursor.execute(f"SELECT id, parent_id, label FROM {table} ORDER BY id")
+                cursor.fetchall()
+                load = time.perf_counter() - started
+            finally:
+                cursor.execute(f"DROP TABLE {table}")
+        return insert, load
@@ -0,0 +1,80 @@
+import copy
+import math
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from ...utils.generate_node_positions import get_collision_solver
+
+SOLVERS = ["naive", "grid", "numpy"]
+
+
+class Command(BaseCommand):
+    help = "Benchmark the child-placement collision solvers on synthetic maps."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes", type=int, nargs="+", default=[1000, 10000, 50000]
+        )
+        parser.add_argument("--children", type=int, default=8)
+        parser.add_argument("--repeat", type=int, default=3)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--solvers", nargs="+", choices=SOLVERS, default=SOLVERS)
+
+    def handle(self, *args, **options):
+        for size in options["sizes"]:
+            existing_nodes, new_nodes = self._build_map(
+                size, options["children"], options["seed"]
+            )
+            results = {}
+            for name in options["solvers"]:
+                timings = []
+                for _ in range(options["repeat"]):
+                    all_nodes = copy.deepcopy(existing_nodes + new_nodes)
+                    placed = all_nodes[len(existing_nodes) :]
+                    started = time.perf_counter()
+                    get_collision_solver(name)(placed, all_nodes)
+                    timings.append(time.perf_counter() - started)
+                results[name] = placed
+                self.stdout.write(
+                    f"{size:>7} nodes  {name:<6} "
+                    f"best {min(timings) * 1000:10.2f} ms  "
+                    f"mean {sum(timings) / len(timings) * 1000:10.2f} ms"
+                )
+
+            outputs = list(results.values())
+            if any(output != outputs[0] for output in outputs[1:]):
+                self.stderr.write(self.style.ERROR(f"{size}: solver outputs differ"))
+            elif len(outputs) > 1:
+                self.stdout.write(self.style.SUCCESS(f"{size}: outputs identical"))
+
+    @staticmethod
+    def _build_map(size, children, seed):
+        rng = random.Random(seed)
+        side = math.sqrt(size) * 220
+        existing_nodes = [
+            {
+                "id": f"node-{index}",
+                "position": {
+                    "x": rng.uniform(-side / 2, side / 2),
+                    "y": rng.uniform(-side / 2, side / 2),
+                },
+                "width": rng.uniform(100, 200),
+                "height": rng.uniform(32, 60),
+            }
+            for index in range(size)
+        ]
+        angle_step = (2 * math.pi) / children
+        new_nodes = [
+            {
+                "position": {
+                    "x": 150 * math.cos(index * angle_step),
+                    "y": 150 * math.sin(index * angle_step),
+                },
+                "height": 32,
+                "width": 100,
+            }
+            for index in range(children)
+        ]
+        return existing_nodes, new_nodes
@@ -0,0 +1,63 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count, F
+
+from ...models import MindMap, Node
+
+
+class Command(BaseCommand):
+    help = (
+        "Print the database's EXPLAIN plan for each hot node query, run against "
+        "one mind map (the largest by default), so index regressions show up."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--mind-map", help="Id of the mind map to query.")
+        parser.add_argument(
+            "--analyze",
+            action="store_true",
+            help="Run the queries and report actual timings (EXPLAIN ANALYZE).",
+        )
+        parser.add_argument("--format", help="Plan format, e.g. json or tree.")
+
+    def handle(self, *args, **options):
+        mind_map = self._get_mind_map(options["mind_map"])
+        self.stdout.write(f"Mind map {mind_map.id} ({mind_map.node_count} nodes)")
+
+        explain_options = {}
+        if options["analyze"]:
+            explain_options["analyze"] = True
+        for name, queryset in self._queries(mind_map).items():
+            self.stdout.write(self.style.MIGRATE_HEADING(f"\n{name}"))
+            self.stdout.write(
+                queryset.explain(format=options["format"], **explain_options)
+            )
+
+    @staticmethod
+    def _get_mind_map(mind_map_id):
+        mind_maps = MindMap.objects.annotate(node_count=Count("nodes"))
+        if mind_map_id:
+            mind_maps = mind_maps.filter(pk=mind_map_id)
+        mind_map = mind_maps.order_by("-node_count").first()
+        if mind_map is None:
+            raise CommandError("No mind map to explain.")
+        return mind_map
+
+    @staticmethod
+    def _queries(mind_map):
+        nodes = Node.objects.filter(mind_map=mind_map)
+        return {
+            # MindMapProjectData: the full map payload.
+            "project data": nodes.order_by(
+                F("parent_id").asc(nulls_first=True), "id"
+            ).values_list("id", "parent_id", "flow_data"),
+            # UpdateMindMapNodes: the current tree it diffs against.
+            "node diff": nodes.values_list("id", "parent_id", "flow_data_hash"),
+            # Children of a node, also used by cascading deletes.
+            "children": Node.objects.filter(
+                parent_id=mind_map.root_node_id
+            ).values_list("id"),
+            # PromptContextBuilder: labels and structure for prompts.
+            "prompt context": nodes.order_by("created_at", "id").values_list(
+                "id", "parent_id", "label", "title"
+            ),
+        }
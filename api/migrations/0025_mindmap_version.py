@@ -0,0 +1,18 @@
+# Generated by Django 5.1.1 on 2026-10-18 08:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0024_alter_mindmap_id"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="mindmap",
+            name="version",
+            field=models.PositiveIntegerField(default=1),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.1.1 on 2026-10-18 09:00
+
+from django.db import migrations, models
+
+from api.utils.flow_data import flow_data_hash
+
+
+def backfill_flow_data_hash(apps, schema_editor):
+    Node = apps.get_model("api", "Node")
+    batch = []
+    for node in Node.objects.only("id", "flow_data").iterator(chunk_size=2000):
+        node.flow_data_hash = flow_data_hash(node.flow_data)
+        batch.append(node)
+        if len(batch) == 2000:
+            Node.objects.bulk_update(batch, fields=["flow_data_hash"])
+            batch = []
+    Node.objects.bulk_update(batch, fields=["flow_data_hash"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0025_mindmap_version"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="node",
+            name="flow_data_hash",
+            field=models.CharField(
+                blank=True, editable=False, max_length=32, null=True
+            ),
+        ),
+        migrations.RunPython(backfill_flow_data_hash, migrations.RunPython.noop),
+    ]
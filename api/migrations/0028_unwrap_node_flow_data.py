@@ -0,0 +1,39 @@
+import json
+
+from django.db import migrations
+
+BATCH_SIZE = 2000
+
+
+def unwrap_flow_data(apps, schema_editor):
+    # Rows written before flow_data was stored natively hold JSON text inside a
+    # JSON string; decode them into objects. flow_data_hash already hashes the
+    # decoded value, so it stays the same.
+    Node = apps.get_model("api", "Node")
+    batch = []
+    for node in Node.objects.only("id", "flow_data").iterator(chunk_size=BATCH_SIZE):
+        value = node.flow_data
+        try:
+            while isinstance(value, str):
+                value = json.loads(value)
+        except json.JSONDecodeError:
+            continue
+        if value is node.flow_data:
+            continue
+        node.flow_data = value
+        batch.append(node)
+        if len(batch) >= BATCH_SIZE:
+            Node.objects.bulk_update(batch, fields=["flow_data"])
+            batch = []
+    Node.objects.bulk_update(batch, fields=["flow_data"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0027_note_generation"),
+    ]
+
+    operations = [
+        migrations.RunPython(unwrap_flow_data, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 5.1.1 on 2026-10-18 12:00
+
+from django.db import migrations, models
+
+from api.utils.flow_data import FLOW_DATA_COLUMNS, flow_data_columns
+
+
+def backfill_flow_data_columns(apps, schema_editor):
+    Node = apps.get_model("api", "Node")
+    batch = []
+    for node in Node.objects.only("id", "flow_data").iterator(chunk_size=2000):
+        for field, value in flow_data_columns(node.flow_data).items():
+            setattr(node, field, value)
+        batch.append(node)
+        if len(batch) == 2000:
+            Node.objects.bulk_update(batch, fields=FLOW_DATA_COLUMNS)
+            batch = []
+    Node.objects.bulk_update(batch, fields=FLOW_DATA_COLUMNS)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0028_unwrap_node_flow_data"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="node",
+            name="label",
+            field=models.TextField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="node",
+            name="x",
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="node",
+            name="y",
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="node",
+            name="width",
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="node",
+            name="height",
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="node",
+            index=models.Index(
+                fields=["mind_map", "x", "y"], name="api_node_mind_ma_b6ddc6_idx"
+            ),
+        ),
+        migrations.RunPython(backfill_flow_data_columns, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,166 @@
+# Generated by Django 5.1.1 on 2026-10-18 13:00
+
+from django.db import migrations
+
+import api.models.fields
+
+UUID_PATTERN = (
+    "^[0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{12}$"
+)
+
+# Every column holding a mind map or node id, with whether it is nullable.
+ID_COLUMNS = [
+    ("mindmap", "id", False),
+    ("node", "id", False),
+    ("node", "parent_id", True),
+    ("node", "mind_map_id", False),
+    ("notegeneration", "node_id", False),
+]
+FOREIGN_KEYS = [("node", "parent"), ("node", "mind_map"), ("notegeneration", "node")]
+
+TO_BINARY = "UNHEX(REPLACE({column}, '-', ''))"
+TO_TEXT = (
+    "LOWER(CONCAT_WS('-', HEX(SUBSTR({column}, 1, 4)), HEX(SUBSTR({column}, 5, 2)), "
+    "HEX(SUBSTR({column}, 7, 2)), HEX(SUBSTR({column}, 9, 2)), "
+    "HEX(SUBSTR({column}, 11, 6))))"
+)
+
+
+def column_type(schema_editor, table, column):
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT DATA_TYPE FROM information_schema.COLUMNS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND COLUMN_NAME = %s",
+            [table, column],
+        )
+        return cursor.fetchone()[0].lower()
+
+
+def check_uuid_ids(schema_editor, models):
+    # Rows already converted by an interrupted run are 16 bytes long.
+    with schema_editor.connection.cursor() as cursor:
+        for model_name in ("mindmap", "node"):
+            table = schema_editor.quote_name(models[model_name]._meta.db_table)
+            cursor.execute(
+                f"SELECT COUNT(*) FROM {table} "
+                "WHERE LENGTH(id) > 16 AND id NOT REGEXP %s",
+                [UUID_PATTERN],
+            )
+            (count,) = cursor.fetchone()
+            if count:
+                raise RuntimeError(
+                    f"{count} rows in {table} have an id that is not a UUID; "
+                    "fix them before converting ids to binary."
+                )
+
+
+def convert_id_columns(schema_editor, models, expression, pending, db_type):
+    # The text is rewritten in place: each column becomes varbinary so it can
+    # hold both forms, is converted, then narrowed to its final type. Foreign
+    # keys are dropped for the duration since both ends change type.
+    #
+    # MySQL cannot roll DDL back, so every step is safe to repeat after a
+    # failure: columns already of the final type are skipped, only rows still
+    # matching `pending` are rewritten, and missing foreign keys are always
+    # recreated on the way out.
+    done_type = db_type.split("(")[0]
+    foreign_keys = []
+    for model_name, field_name in FOREIGN_KEYS:
+        model = models[model_name]
+        foreign_keys.append((model, model._meta.get_field(field_name)))
+
+    try:
+        for model, field in foreign_keys:
+            for name in schema_editor._constraint_names(
+                model, [field.column], foreign_key=True
+            ):
+                schema_editor.execute(schema_editor._delete_fk_sql(model, name))
+
+        for model_name, column_name, null in ID_COLUMNS:
+            db_table = models[model_name]._meta.db_table
+            if column_type(schema_editor, db_table, column_name) == done_type:
+                continue
+            table = schema_editor.quote_name(db_table)
+            column = schema_editor.quote_name(column_name)
+            null_sql = "NULL" if null else "NOT NULL"
+            schema_editor.execute(
+                f"ALTER TABLE {table} MODIFY {column} varbinary(36) {null_sql}"
+            )
+            schema_editor.execute(
+                f"UPDATE {table} SET {column} = {expression.format(column=column)} "
+                f"WHERE {pending.format(column=column)}"
+            )
+            schema_editor.execute(
+                f"ALTER TABLE {table} MODIFY {column} {db_type} {null_sql}"
+            )
+    finally:
+        for model, field in foreign_keys:
+            if not schema_editor._constraint_names(
+                model, [field.column], foreign_key=True
+            ):
+                schema_editor.execute(
+                    schema_editor._create_fk_sql(
+                        model, field, "_fk_%(to_table)s_%(to_column)s"
+                    )
+                )
+
+
+def get_models(apps):
+    return {
+        name: apps.get_model("api", name)
+        for name in ("mindmap", "node", "notegeneration")
+    }
+
+
+def ids_to_binary(apps, schema_editor):
+    # Only MySQL stores the ids as bytes; elsewhere the column stays text.
+    if schema_editor.connection.vendor != "mysql":
+        return
+    models = get_models(apps)
+    check_uuid_ids(schema_editor, models)
+    convert_id_columns(
+        schema_editor, models, TO_BINARY, "LENGTH({column}) > 16", "binary(16)"
+    )
+
+
+def ids_to_text(apps, schema_editor):
+    if schema_editor.connection.vendor != "mysql":
+        return
+    convert_id_columns(
+        schema_editor,
+        get_models(apps),
+        TO_TEXT,
+        "LENGTH({column}) = 16",
+        "varchar(36)",
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0029_node_flow_data_columns"),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AlterField(
+                    model_name="mindmap",
+                    name="id",
+                    field=api.models.fields.BinaryUUIDField(
+                        editable=False, primary_key=True, serialize=False
+                    ),
+                ),
+                migrations.AlterField(
+                    model_name="node",
+                    name="id",
+                    field=api.models.fields.BinaryUUIDField(
+                        editable=False, primary_key=True, serialize=False
+                    ),
+                ),
+            ],
+            database_operations=[
+                migrations.RunPython(ids_to_binary, ids_to_text),
+            ],
+        ),
+    ]
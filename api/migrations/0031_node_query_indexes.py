@@ -0,0 +1,36 @@
+# Generated by Django 5.1.1 on 2026-10-18 09:27
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0030_binary_uuid_ids"),
+    ]
+
+    # The new index is created first: on MySQL it takes over from the
+    # mind_map foreign key's own index, which is dropped next.
+    operations = [
+        migrations.AddIndex(
+            model_name="node",
+            index=models.Index(
+                fields=["mind_map", "parent"], name="api_node_mind_ma_7242c1_idx"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="node",
+            name="mind_map",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="nodes",
+                to="api.mindmap",
+            ),
+        ),
+        migrations.RemoveIndex(
+            model_name="node",
+            name="api_node_id_67d739_idx",
+        ),
+    ]
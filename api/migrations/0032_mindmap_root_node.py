@@ -0,0 +1,37 @@
+# Generated by Django 5.1.1 on 2026-10-18 15:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_root_node(apps, schema_editor):
+    MindMap = apps.get_model("api", "MindMap")
+    Node = apps.get_model("api", "Node")
+    roots = Node.objects.filter(mind_map=OuterRef("pk"), parent__isnull=True).order_by(
+        "created_at", "id"
+    )
+    MindMap.objects.update(root_node=Subquery(roots.values("id")[:1]))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0031_node_query_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="mindmap",
+            name="root_node",
+            field=models.ForeignKey(
+                blank=True,
+                editable=False,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="+",
+                to="api.node",
+            ),
+        ),
+        migrations.RunPython(backfill_root_node, migrations.RunPython.noop),
+    ]
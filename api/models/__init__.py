@@ -1,2 +1,3 @@
 from .mindmap import MindMap
 from .node import Node
+from .note_generation import NoteGeneration
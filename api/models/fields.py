@@ -0,0 +1,49 @@
+import uuid
+
+from django.core import exceptions
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+class BinaryUUIDField(models.UUIDField):
+    # A UUID kept as 16 raw bytes on MySQL (as text elsewhere) that reads and
+    # writes as its canonical string, so callers still deal in plain strings.
+    description = _("UUID stored as 16 bytes")
+
+    def get_internal_type(self):
+        # Keeps backends from applying their own UUIDField conversions.
+        return "BinaryUUIDField"
+
+    def db_type(self, connection):
+        if connection.vendor == "mysql":
+            return "binary(16)"
+        return "varchar(36)"
+
+    def to_python(self, value):
+        if value is None:
+            return None
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            return str(uuid.UUID(bytes=bytes(value)))
+        try:
+            return str(value if isinstance(value, uuid.UUID) else uuid.UUID(value))
+        except (AttributeError, TypeError, ValueError):
+            raise exceptions.ValidationError(
+                self.error_messages["invalid"],
+                code="invalid",
+                params={"value": value},
+            )
+
+    def get_prep_value(self, value):
+        return self.to_python(models.Field.get_prep_value(self, value))
+
+    def get_db_prep_value(self, value, connection, prepared=False):
+        if not prepared:
+            value = self.get_prep_value(value)
+        if value is not None and connection.vendor == "mysql":
+            return uuid.UUID(value).bytes
+        return value
+
+    def from_db_value(self, value, expression, connection):
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            return str(uuid.UUID(bytes=bytes(value)))
+        return value
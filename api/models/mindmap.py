@@ -1,14 +1,26 @@
-import uuid
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth.models import User
 
+from .fields import BinaryUUIDField
+from ..utils.payload_cache import invalidate_mindmap_payload
+from ..utils.uuid7 import uuid7
+
 
 class MindMap(models.Model):
-    id = models.CharField(max_length=36, primary_key=True, editable=False)
+    id = BinaryUUIDField(primary_key=True, editable=False)
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     title = models.CharField(max_length=200)
     is_private = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    version = models.PositiveIntegerField(default=1)
+    root_node = models.ForeignKey(
+        "Node",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name="+",
+    )
 
     class Meta:
         indexes = [
@@ -18,7 +30,16 @@ class MindMap(models.Model):
     def __str__(self):
         return self.title
 
+    @property
+    def etag(self):
+        return f'"{self.id}-{self.version}"'
+
+    @classmethod
+    def bump_version(cls, mind_map_id):
+        cls.objects.filter(pk=mind_map_id).update(version=models.F("version") + 1)
+        transaction.on_commit(lambda: invalidate_mindmap_payload(mind_map_id))
+
     def save(self, *args, **kwargs):
         if not self.id:
-            self.id = uuid.uuid4()
+            self.id = uuid7()
         super().save(*args, **kwargs)
@@ -1,25 +1,40 @@
-import uuid
 from django.db import models
 from django.core.exceptions import ValidationError
+from .fields import BinaryUUIDField
 from .mindmap import MindMap
+from ..utils.flow_data import flow_data_columns
+from ..utils.uuid7 import uuid7
 
 
 class Node(models.Model):
-    id = models.CharField(max_length=36, primary_key=True, editable=False)
+    id = BinaryUUIDField(primary_key=True, editable=False)
     title = models.CharField(max_length=200, null=True)
     note = models.TextField(blank=True, null=True)
+    note_token_usage = models.JSONField(null=True, blank=True)
     parent = models.ForeignKey(
         "self", on_delete=models.CASCADE, null=True, blank=True, related_name="children"
     )
     mind_map = models.ForeignKey(
-        MindMap, on_delete=models.CASCADE, related_name="nodes"
+        MindMap, on_delete=models.CASCADE, related_name="nodes", db_index=False
     )
     created_at = models.DateTimeField(auto_now_add=True)
     flow_data = models.JSONField(null=True, blank=True)
+    flow_data_hash = models.CharField(
+        max_length=32, null=True, blank=True, editable=False
+    )
+    label = models.TextField(null=True, blank=True, editable=False)
+    x = models.FloatField(null=True, blank=True, editable=False)
+    y = models.FloatField(null=True, blank=True, editable=False)
+    width = models.FloatField(null=True, blank=True, editable=False)
+    height = models.FloatField(null=True, blank=True, editable=False)
 
     class Meta:
         indexes = [
-            models.Index(fields=["id", "parent", "mind_map"]),
+            # Every per-map read filters on mind_map and either orders by or
+            # filters on parent (the root has none); the primary key InnoDB
+            # appends also serves the project data's parent, id ordering.
+            models.Index(fields=["mind_map", "parent"]),
+            models.Index(fields=["mind_map", "x", "y"]),
         ]
 
     def __str__(self):
@@ -31,6 +46,8 @@ class Node(models.Model):
 
     def save(self, *args, **kwargs):
         if not self.id:
-            self.id = uuid.uuid4()
+            self.id = uuid7()
+        for field, value in flow_data_columns(self.flow_data).items():
+            setattr(self, field, value)
         self.full_clean()
         super().save(*args, **kwargs)
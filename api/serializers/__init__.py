@@ -1,8 +1,11 @@
 from .user import UserSerializer
 from .mindmap import (
     MindMapSerializer,
+    MindMapSummarySerializer,
     MindMapCreateSerializer,
     MindMapUpdateSerializer,
+    MindMapOperationsSerializer,
+    MindMapLayoutSerializer,
     MindMapListSerializer,
 )
 from .node import (
@@ -11,5 +14,8 @@ from .node import (
     NodeUpdateSerializer,
     GeneratedChildrenSerializer,
     AutoGenerateChildrenSerializer,
+    GeneratedChildrenBatchSerializer,
+    AutoGenerateChildrenBatchSerializer,
     AutoGenerateNoteSerializer,
+    NoteGenerationSerializer,
 )
@@ -1,13 +1,12 @@
-import json
-from django.core.serializers.json import DjangoJSONEncoder
 from rest_framework import serializers
 from django.db import transaction
-import uuid
 
 from ..models import MindMap, Node
 from ..serializers import UserSerializer
 from ..utils.json_field_serializer import JSONFieldSerializer
-from ..services import UpdateMindMapNodes
+from ..utils.payload_cache import invalidate_mindmap_payload
+from ..utils.uuid_field_serializer import UUIDFieldSerializer
+from ..services import UpdateMindMapNodes, MindMapProjectData
 
 
 class NodeSerializer(serializers.ModelSerializer):
@@ -18,49 +17,22 @@ class NodeSerializer(serializers.ModelSerializer):
         fields = ["id", "title", "parent", "flow_data", "created_at"]
 
 
-class MindMapSerializer(serializers.ModelSerializer):
+class MindMapSummarySerializer(serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
-    project_data = serializers.SerializerMethodField()
 
     class Meta:
         model = MindMap
-        fields = ["id", "title", "user", "created_at", "user", "project_data"]
+        fields = ["id", "title", "user", "created_at"]
 
-    def get_project_data(self, obj):
-        nodes = Node.objects.filter(mind_map=obj).values("id", "parent_id", "flow_data")
-        root_node = Node.objects.get(mind_map=obj, parent_id__isnull=True)
-        node_list = []
-        relationship_list = []
-
-        def get_parent_id(node, root_node):
-            if node["parent_id"] == root_node.id:
-                return "root"
-            elif node["parent_id"] is not None:
-                return str(node["parent_id"])
-            else:
-                return None
-
-        for node in nodes:
-            node_data = {
-                "dbId": str(node["id"]),
-                "id": (
-                    "root" if str(node["id"]) == str(root_node.id) else str(node["id"])
-                ),
-                "parent_id": get_parent_id(node, root_node),
-                "flow_data": (
-                    json.loads(node["flow_data"]) if node["flow_data"] else None
-                ),
-            }
-            node_list.append(node_data)
 
-            relationship = {
-                "id": str(uuid.uuid4()),
-                "source": node_data["parent_id"],
-                "target": node_data["id"],
-            }
-            relationship_list.append(relationship)
+class MindMapSerializer(MindMapSummarySerializer):
+    project_data = serializers.SerializerMethodField()
+
+    class Meta(MindMapSummarySerializer.Meta):
+        fields = MindMapSummarySerializer.Meta.fields + ["project_data"]
 
-        return {"nodes": node_list, "relationships": relationship_list}
+    def get_project_data(self, obj):
+        return MindMapProjectData.build(obj)
 
 
 class MindMapListSerializer(serializers.ModelSerializer):
@@ -70,8 +42,9 @@ class MindMapListSerializer(serializers.ModelSerializer):
 
 
 class MindMapUpdateNodeSerializer(serializers.ModelSerializer):
-    id = serializers.CharField(required=False)
+    id = UUIDFieldSerializer(required=False)
     parent = serializers.CharField(allow_null=True, required=False)
+    flow_data = JSONFieldSerializer(required=False, allow_null=True)
 
     class Meta:
         model = Node
@@ -86,13 +59,47 @@ class MindMapUpdateSerializer(serializers.ModelSerializer):
         fields = ["nodes"]
 
     def update(self, instance, validated_data):
+        self.changes = {}
         if "nodes" in validated_data:
-            UpdateMindMapNodes.run(instance, validated_data["nodes"])
+            self.changes = UpdateMindMapNodes.run(instance, validated_data["nodes"])
 
         return instance
 
     def to_representation(self, instance):
-        return {"message": "Mind map updated successfully"}
+        return {
+            "message": "Mind map updated successfully",
+            **getattr(self, "changes", {}),
+        }
+
+
+class MindMapOperationSerializer(serializers.Serializer):
+    op = serializers.ChoiceField(choices=["add", "move", "update", "delete"])
+    id = UUIDFieldSerializer()
+    parent = UUIDFieldSerializer(required=False)
+    flow_data = JSONFieldSerializer(required=False, allow_null=True)
+
+    def validate(self, attrs):
+        if attrs["op"] in ("add", "move") and not attrs.get("parent"):
+            raise serializers.ValidationError(
+                {"parent": f"This field is required for '{attrs['op']}'."}
+            )
+        if attrs["op"] == "update" and "flow_data" not in attrs:
+            raise serializers.ValidationError(
+                {"flow_data": "This field is required for 'update'."}
+            )
+        return attrs
+
+
+class MindMapOperationsSerializer(serializers.Serializer):
+    base_version = serializers.IntegerField(required=False, min_value=1)
+    operations = MindMapOperationSerializer(many=True, allow_empty=False)
+
+
+class MindMapLayoutSerializer(serializers.Serializer):
+    algorithm = serializers.ChoiceField(choices=["tidy", "radial"], default="tidy")
+    root = UUIDFieldSerializer(required=False)
+    level_spacing = serializers.FloatField(required=False, min_value=1)
+    sibling_spacing = serializers.FloatField(required=False, min_value=1)
 
 
 class MindMapCreateSerializer(serializers.ModelSerializer):
@@ -115,11 +122,13 @@ class MindMapCreateSerializer(serializers.ModelSerializer):
                 "dragHandle": ".dragHandle",
             }
 
-            Node.objects.create(
+            mind_map.root_node = Node.objects.create(
                 title=mind_map.title,
                 mind_map=mind_map,
                 parent=None,
-                flow_data=json.dumps(flow_data, cls=DjangoJSONEncoder),
+                flow_data=flow_data,
             )
+            mind_map.save(update_fields=["root_node"])
+            transaction.on_commit(lambda: invalidate_mindmap_payload(mind_map.id))
 
         return {"id": mind_map.id, "title": mind_map.title}
@@ -1,6 +1,8 @@
+from django.conf import settings
 from rest_framework import serializers
-from ..models import Node
+from ..models import Node, NoteGeneration
 from ..utils.json_field_serializer import JSONFieldSerializer
+from ..utils.uuid_field_serializer import UUIDFieldSerializer
 
 
 class NodeSerializer(serializers.ModelSerializer):
@@ -8,8 +10,16 @@ class NodeSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Node
-        fields = ["id", "title", "parent", "flow_data", "note", "created_at"]
-        read_only_fields = ["parent"]
+        fields = [
+            "id",
+            "title",
+            "parent",
+            "flow_data",
+            "note",
+            "note_token_usage",
+            "created_at",
+        ]
+        read_only_fields = ["parent", "note_token_usage"]
 
 
 class NodeCreateSerializer(serializers.ModelSerializer):
@@ -39,6 +49,7 @@ class AutoGenerateChildrenSerializer(serializers.Serializer):
     nodes_position = serializers.ListField()
     ai_key = serializers.CharField(max_length=255, required=False, allow_null=True)
     ai_model = serializers.CharField(max_length=100, required=False, allow_null=True)
+    force = serializers.BooleanField(required=False, default=False)
 
     def validate_num_children(self, value):
         if value < 1:
@@ -46,7 +57,62 @@ class AutoGenerateChildrenSerializer(serializers.Serializer):
         return value
 
 
+class GeneratedChildrenResultSerializer(serializers.Serializer):
+    id = serializers.CharField()
+    children = GenerateChildrenNodeSerializer(many=True, read_only=True)
+
+
+class GenerationErrorSerializer(serializers.Serializer):
+    id = serializers.CharField()
+    detail = serializers.CharField()
+
+
+class GeneratedChildrenBatchSerializer(serializers.Serializer):
+    results = GeneratedChildrenResultSerializer(many=True, read_only=True)
+    errors = GenerationErrorSerializer(many=True, read_only=True)
+
+
+class AutoGenerateChildrenBatchSerializer(serializers.Serializer):
+    node_ids = serializers.ListField(
+        child=UUIDFieldSerializer(),
+        min_length=1,
+        max_length=settings.GENERATION_RUNNER["BATCH_MAX_NODES"],
+    )
+    nodes_position = serializers.ListField()
+    ai_key = serializers.CharField(max_length=255, required=False, allow_null=True)
+    ai_model = serializers.CharField(max_length=100, required=False, allow_null=True)
+    force = serializers.BooleanField(required=False, default=False)
+
+    def validate_node_ids(self, value):
+        return list(dict.fromkeys(value))
+
+
 class AutoGenerateNoteSerializer(serializers.Serializer):
     instruction = serializers.CharField(required=False, max_length=500)
     ai_key = serializers.CharField(max_length=255, required=False, allow_null=True)
     ai_model = serializers.CharField(max_length=100, required=False, allow_null=True)
+    stream = serializers.BooleanField(required=False, default=False)
+    force = serializers.BooleanField(required=False, default=False)
+
+
+class NoteGenerationSerializer(serializers.ModelSerializer):
+    note = serializers.SerializerMethodField()
+
+    class Meta:
+        model = NoteGeneration
+        fields = [
+            "id",
+            "node",
+            "status",
+            "error",
+            "note",
+            "token_usage",
+            "created_at",
+            "finished_at",
+        ]
+        read_only_fields = fields
+
+    def get_note(self, obj):
+        if obj.status != NoteGeneration.COMPLETED:
+            return None
+        return obj.node.note
@@ -1,3 +1,7 @@
 from .auto_generate_node_children import NodeChildrenGenerator
 from .update_mindmap_nodes import UpdateMindMapNodes
 from .auto_generate_node_note import NodeNoteGenerator
+from .mindmap_project_data import MindMapProjectData
+from .apply_mindmap_operations import ApplyMindMapOperations
+from .layout_mindmap import LayoutMindMap
+from .prompt_context import PromptContextBuilder
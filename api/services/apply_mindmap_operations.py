@@ -0,0 +1,201 @@
+from typing import Any, Dict, List, Optional
+
+from django.db import transaction
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+
+from ..models import MindMap, Node
+from ..utils.flow_data import FLOW_DATA_COLUMNS, flow_data_columns
+from ..utils.node_order import parents_first
+
+
+class MindMapVersionConflict(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "The mind map has been changed since the base version."
+    default_code = "version_conflict"
+
+
+class ApplyMindMapOperations:
+    @classmethod
+    @transaction.atomic
+    def run(
+        cls,
+        mind_map,
+        operations: List[Dict[str, Any]],
+        base_version: Optional[int] = None,
+    ) -> Dict[str, int]:
+        version = (
+            MindMap.objects.select_for_update()
+            .values_list("version", flat=True)
+            .get(pk=mind_map.pk)
+        )
+        if base_version is not None and base_version != version:
+            raise MindMapVersionConflict(
+                f"{MindMapVersionConflict.default_detail} Current version is {version}."
+            )
+
+        referenced = {op["id"] for op in operations} | {
+            op["parent"] for op in operations if op.get("parent")
+        }
+        parents = {
+            str(node_id): str(parent_id) if parent_id else None
+            for node_id, parent_id in Node.objects.filter(
+                mind_map=mind_map, id__in=referenced
+            ).values_list("id", "parent_id")
+        }
+        existing = set(parents)
+        created: Dict[str, Node] = {}
+        moved: Dict[str, str] = {}
+        updated: Dict[str, Any] = {}
+        deleted = set()
+
+        # Every add, move and delete gets the next tick. A node is gone if it
+        # was deleted after it was (re)created, or if an ancestor was deleted
+        # after the node was attached to it: the deletion cascades to every
+        # edge that existed at that moment, but not to nodes added to a
+        # re-created id later.
+        clock = iter(range(len(operations) * 2))
+        born: Dict[str, int] = {}
+        attached: Dict[str, int] = {}
+        deleted_at: Dict[str, int] = {}
+
+        def parent_of(node_id):
+            if node_id not in parents:
+                parent_id = (
+                    Node.objects.filter(mind_map=mind_map, id=node_id)
+                    .values_list("parent_id", flat=True)
+                    .first()
+                )
+                parents[node_id] = str(parent_id) if parent_id else None
+            return parents[node_id]
+
+        def exists(node_id):
+            if node_id not in existing and node_id not in born:
+                return False
+            if deleted_at.get(node_id, -2) >= born.get(node_id, -1):
+                return False
+            current = node_id
+            while deleted_at and (parent_id := parent_of(current)) is not None:
+                if deleted_at.get(parent_id, -2) >= attached.get(current, -1):
+                    return False
+                current = parent_id
+            return True
+
+        def is_descendant(node_id, ancestor_id):
+            current = node_id
+            while current is not None:
+                if current == ancestor_id:
+                    return True
+                current = parent_of(current)
+            return False
+
+        for index, op in enumerate(operations):
+            kind = op["op"]
+            node_id = op["id"]
+            parent_id = op.get("parent")
+
+            if kind == "add":
+                if exists(node_id):
+                    cls._fail(index, f"Node '{node_id}' already exists.")
+                if not exists(parent_id):
+                    cls._fail(index, f"Parent node '{parent_id}' does not exist.")
+                if node_id in existing:
+                    # Reusing the id of a stored node removed earlier in the
+                    # batch: the old row goes before the new one is created.
+                    deleted.add(node_id)
+                    deleted_at[node_id] = next(clock)
+                created[node_id] = Node(
+                    id=node_id,
+                    mind_map=mind_map,
+                    parent_id=parent_id,
+                    flow_data=op.get("flow_data"),
+                    **flow_data_columns(op.get("flow_data")),
+                )
+                parents[node_id] = parent_id
+                born[node_id] = attached[node_id] = next(clock)
+                moved.pop(node_id, None)
+                updated.pop(node_id, None)
+                continue
+
+            if not exists(node_id):
+                cls._fail(index, f"Node '{node_id}' does not exist.")
+            if kind in ("move", "delete") and parents[node_id] is None:
+                cls._fail(index, "The root node cannot be moved or deleted.")
+
+            if kind == "move":
+                if not exists(parent_id):
+                    cls._fail(index, f"Parent node '{parent_id}' does not exist.")
+                if is_descendant(parent_id, node_id):
+                    cls._fail(index, "A node cannot be moved under itself.")
+                parents[node_id] = parent_id
+                attached[node_id] = next(clock)
+                if node_id in created:
+                    created[node_id].parent_id = parent_id
+                else:
+                    moved[node_id] = parent_id
+                if "flow_data" in op:
+                    kind = "update"
+
+            if kind == "update":
+                if node_id in created:
+                    created[node_id].flow_data = op.get("flow_data")
+                    columns = flow_data_columns(op.get("flow_data"))
+                    for field, value in columns.items():
+                        setattr(created[node_id], field, value)
+                else:
+                    updated[node_id] = op.get("flow_data")
+
+            elif kind == "delete":
+                deleted_at[node_id] = next(clock)
+                created.pop(node_id, None)
+                if node_id in existing:
+                    deleted.add(node_id)
+                    moved.pop(node_id, None)
+                    updated.pop(node_id, None)
+
+        # Drop whatever ended up under a deleted node. Stored nodes removed
+        # that way are deleted explicitly, since a move that would have put
+        # them under the deleted node is never written.
+        created = {
+            node_id: node for node_id, node in created.items() if exists(node_id)
+        }
+        deleted |= {node_id for node_id in existing if not exists(node_id)}
+        moved = {node_id: p for node_id, p in moved.items() if node_id not in deleted}
+        updated = {
+            node_id: data for node_id, data in updated.items() if node_id not in deleted
+        }
+
+        # Moved nodes are detached first so deleting their old ancestors does
+        # not cascade to them, and deletions run before creates so an id can be
+        # reused within one batch.
+        if deleted and moved:
+            Node.objects.bulk_update(
+                [Node(id=node_id, parent_id=None) for node_id in moved],
+                fields=["parent"],
+            )
+        Node.objects.filter(mind_map=mind_map, id__in=deleted).delete()
+        Node.objects.bulk_create(parents_first(created))
+        Node.objects.bulk_update(
+            [Node(id=node_id, parent_id=parent) for node_id, parent in moved.items()],
+            fields=["parent"],
+        )
+        Node.objects.bulk_update(
+            [
+                Node(id=node_id, flow_data=data, **flow_data_columns(data))
+                for node_id, data in updated.items()
+            ],
+            fields=["flow_data", *FLOW_DATA_COLUMNS],
+        )
+        MindMap.bump_version(mind_map.pk)
+
+        return {
+            "version": version + 1,
+            "created": len(created),
+            "moved": len(moved),
+            "updated": len(updated),
+            "deleted": len(deleted),
+        }
+
+    @staticmethod
+    def _fail(index: int, message: str):
+        raise ValidationError({"operations": {index: [message]}})
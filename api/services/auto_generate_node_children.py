@@ -1,13 +1,21 @@
-import uuid
-from typing import List, Dict
+import asyncio
+from typing import Any, List, Dict
 import logging
 import json
 
+from asgiref.sync import sync_to_async
+from django.conf import settings
 from django.core.exceptions import ValidationError
+from django.db import close_old_connections
 from pydantic import BaseModel
-from openai import AsyncOpenAI
-
-from ..utils.generate_node_positions import generate_node_positions
+from ..utils.generation_cache import generation_cache_key, get_generation_cache
+from ..utils.generate_node_positions import (
+    generate_node_positions,
+    get_collision_solver,
+)
+from ..utils.openai_clients import openai_clients
+from ..utils.uuid7 import uuid7
+from .prompt_context import PromptContextBuilder
 
 logger = logging.getLogger(__name__)
 
@@ -33,59 +41,142 @@ class NodeChildrenGenerator:
                 "x": pos["position"]["x"],
                 "y": pos["position"]["y"],
                 "title": subtopic["title"],
-                "id": uuid.uuid4(),
+                "id": pos.get("id") or str(uuid7()),
             }
             for pos, subtopic in zip(positions, subtopics)
         ]
 
     @staticmethod
-    def _prepare_node_data(positions: List[Dict]) -> List[Dict]:
-        return (
-            [
-                {
-                    "id": item["id"],
-                    "title": item["title"],
-                    "parent_node": item.get("parentNode"),
-                }
-                for item in positions
-            ]
-            if positions
-            else []
-        )
+    def _parent_position(node) -> Dict:
+        return {"position": {"x": node.x or 0, "y": node.y or 0}}
+
+    @staticmethod
+    def _context_builder(mind_map_id, ai_model) -> PromptContextBuilder:
+        # Runs on the generation runner's thread, outside any request cycle.
+        close_old_connections()
+        return PromptContextBuilder.for_mind_map(mind_map_id, model=ai_model)
 
     @staticmethod
-    def _create_subtopic_prompt(node, nodes_structure: List[Dict]) -> str:
+    def _create_subtopic_prompt(node, node_title: str, context: str) -> str:
         return f"""
-        I am making a mind map & these are the current nodes structure.
+        I am making a mind map & this is the structure around the node I am expanding.
         ```
-        {nodes_structure}
+        {context}
         ```
-        I need your help to generate the next layer of children nodes for the '{node.id}' node with title '{node.title}'.
+        I need your help to generate the next layer of children nodes for the '{node.id}' node with title '{node_title}' (marked as current).
         Please keep the amount of children nodes between 3 - 10.
         """
 
     @classmethod
     async def generate(
-        cls, ai_model, ai_key, node, positions: List[Dict] = None
+        cls, ai_model, ai_key, node, positions: List[Dict] = None, force: bool = False
     ) -> List[Dict]:
-        async with AsyncOpenAI(api_key=ai_key) as client:
-            nodes_structure = cls._prepare_node_data(positions)
-            subtopic_prompt = cls._create_subtopic_prompt(node, nodes_structure)
-
-            try:
-                response = await client.beta.chat.completions.parse(
-                    model=ai_model,
-                    messages=[
-                        {"role": "system", "content": "You are a helpful assistant."},
-                        {"role": "user", "content": subtopic_prompt},
-                    ],
-                    response_format=SubtopicList,
-                )
-                subtopics = json.loads(response.choices[0].message.content)
-                new_positions = generate_node_positions(
-                    json.loads(node.flow_data), len(subtopics["subtopics"]), positions
+        builder = await sync_to_async(cls._context_builder)(node.mind_map_id, ai_model)
+
+        try:
+            subtopics = await cls._generate_subtopics(
+                ai_model, ai_key, node, builder, force
+            )
+            new_positions = generate_node_positions(
+                cls._parent_position(node), len(subtopics), positions
+            )
+            return cls._combine_children_data(new_positions, subtopics)
+        except Exception as e:
+            logger.error(f"Error generating children: {str(e)}")
+            raise
+
+    @classmethod
+    async def generate_batch(
+        cls,
+        ai_model,
+        ai_key,
+        nodes,
+        positions: List[Dict] = None,
+        max_concurrency: int = None,
+        force: bool = False,
+    ) -> Dict[str, Any]:
+        max_concurrency = (
+            max_concurrency or settings.GENERATION_RUNNER["BATCH_CONCURRENCY"]
+        )
+        builder = await sync_to_async(cls._context_builder)(
+            nodes[0].mind_map_id, ai_model
+        )
+        slots = asyncio.Semaphore(max_concurrency)
+
+        async def generate_one(node):
+            async with slots:
+                return await cls._generate_subtopics(
+                    ai_model, ai_key, node, builder, force
                 )
-                return cls._combine_children_data(new_positions, subtopics["subtopics"])
-            except Exception as e:
-                logger.error(f"Error generating children: {str(e)}")
-                raise
+
+        outcomes = await asyncio.gather(
+            *(generate_one(node) for node in nodes), return_exceptions=True
+        )
+
+        # One layout pass over every new child: new children get ids up front and
+        # join the obstacles once placed, so neither siblings nor children of
+        # different nodes end up on top of each other.
+        obstacles = list(positions or [])
+        placed = []
+        errors = []
+        for node, outcome in zip(nodes, outcomes):
+            if isinstance(outcome, BaseException):
+                logger.error(f"Error generating children: {str(outcome)}")
+                errors.append({"id": node.id, "detail": str(outcome)})
+                continue
+
+            new_positions = generate_node_positions(
+                cls._parent_position(node),
+                len(outcome),
+                obstacles,
+                ids=[str(uuid7()) for _ in outcome],
+            )
+            children = cls._combine_children_data(new_positions, outcome)
+            obstacles.extend(new_positions)
+            placed.append((node, new_positions, children))
+
+        # Resolving a later node's children also moves earlier ones, so settle
+        # all of them together once more.
+        get_collision_solver()(
+            [position for _, new_positions, _ in placed for position in new_positions],
+            obstacles,
+        )
+
+        results = []
+        for node, new_positions, children in placed:
+            for position, child in zip(new_positions, children):
+                child["x"] = position["position"]["x"]
+                child["y"] = position["position"]["y"]
+            results.append({"id": node.id, "children": children})
+        return {"results": results, "errors": errors}
+
+    @classmethod
+    async def _generate_subtopics(
+        cls, ai_model, ai_key, node, builder: PromptContextBuilder, force: bool = False
+    ) -> List[Dict]:
+        subtopic_prompt = cls._create_subtopic_prompt(
+            node, node.title or builder.labels.get(node.id), builder.build(node.id)
+        )
+        messages = [
+            {"role": "system", "content": "You are a helpful assistant."},
+            {"role": "user", "content": subtopic_prompt},
+        ]
+
+        # Only the model output is cached; layout always uses current positions.
+        cache = get_generation_cache()
+        cache_key = generation_cache_key("children", ai_model, messages)
+        if cache is not None and not force:
+            subtopics = await cache.aget(cache_key)
+            if subtopics is not None:
+                return subtopics
+
+        client = openai_clients.get_async(ai_key)
+        response = await client.beta.chat.completions.parse(
+            model=ai_model,
+            messages=messages,
+            response_format=SubtopicList,
+        )
+        subtopics = json.loads(response.choices[0].message.content)["subtopics"]
+        if cache is not None:
+            await cache.aset(cache_key, subtopics)
+        return subtopics
@@ -1,16 +1,22 @@
-import os
-import concurrent.futures
-import requests
-import json
-from typing import List, Dict, Any, Optional
+import logging
+from typing import List, Dict, Any, Optional, Callable
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections, transaction
+from django.utils import timezone
 from rest_framework.exceptions import APIException
 
+from ..utils.generation_cache import generation_cache_key, get_generation_cache
 from ..utils.openai import OpenaiUtil
-from ..models import Node
+from ..models import MindMap, Node, NoteGeneration
+from .generation_runner import generation_runner
+from .note_event_stream import NoteEventStream
+from .prompt_context import PromptContextBuilder
+from .socket_relay import socket_relay
 
-SOCKET_URL = os.environ.get("SOCKET_URL")
+STREAM_ACTION = "notaminda-node-auto-generate-note"
+FINISHED_ACTION = "notaminda-node-auto-generate-note-finished"
 
-thread_pool = concurrent.futures.ThreadPoolExecutor(max_workers=10)
+logger = logging.getLogger(__name__)
 
 
 class NodeNoteGenerator:
@@ -21,50 +27,80 @@ class NodeNoteGenerator:
         instruction: Optional[str] = None,
         ai_key: Optional[str] = None,
         ai_model: Optional[str] = None,
+        force: bool = False,
     ) -> Dict[str, Any]:
-        try:
-            nodes = cls._get_nodes(node)
-            message = cls._create_message(node, nodes, instruction)
-            messages = cls._create_chat_messages(message)
+        job = cls._start(
+            node,
+            instruction,
+            ai_key,
+            ai_model,
+            force,
+            lambda: socket_relay.open_stream(STREAM_ACTION, FINISHED_ACTION, node.id),
+        )
+        return {"success": True, "message": "Stream started", "job_id": str(job.id)}
 
-            # Submit the task to the thread pool instead of creating a new thread
-            thread_pool.submit(
-                cls._run_chat_stream, node.id, messages, ai_key, ai_model
-            )
+    @classmethod
+    def stream(
+        cls,
+        node: Node,
+        instruction: Optional[str] = None,
+        ai_key: Optional[str] = None,
+        ai_model: Optional[str] = None,
+        force: bool = False,
+    ) -> NoteEventStream:
+        events = NoteEventStream()
+        job = cls._start(node, instruction, ai_key, ai_model, force, lambda: events)
+        events.job_id = str(job.id)
+        return events
 
-            return {"success": True, "message": "Stream started"}
+    @classmethod
+    def _start(
+        cls,
+        node: Node,
+        instruction: Optional[str],
+        ai_key: Optional[str],
+        ai_model: Optional[str],
+        force: bool,
+        open_sink: Callable[[], Any],
+    ) -> NoteGeneration:
+        try:
+            messages = cls._prepare_messages(node, instruction, ai_model)
+            user_id = node.mind_map.user_id
+            job = NoteGeneration.objects.create(node=node, user_id=user_id)
+            try:
+                generation_runner.submit(
+                    user_id,
+                    lambda: cls._run_chat_stream(
+                        str(job.id), open_sink, messages, ai_key, ai_model, force
+                    ),
+                )
+            except Exception:
+                job.delete()
+                raise
+            return job
+        except APIException:
+            raise
         except Exception as e:
             raise APIException(f"Failed to start auto-generation: {str(e)}")
 
-    @staticmethod
-    def _get_nodes(node: Node) -> List[Dict[str, Any]]:
-        nodes = Node.objects.filter(mind_map=node.mind_map).values(
-            "id", "title", "parent", "flow_data"
-        )
-        return [
-            {
-                "id": node["id"],
-                "label": (
-                    json.loads(node["flow_data"])["data"]["label"]
-                    if node["flow_data"]
-                    else node["title"]
-                ),
-                "parent": node["parent"],
-            }
-            for node in nodes
-        ]
+    @classmethod
+    def _prepare_messages(
+        cls, node: Node, instruction: Optional[str], ai_model: Optional[str]
+    ) -> List[Dict[str, str]]:
+        builder = PromptContextBuilder.for_mind_map(node.mind_map_id, model=ai_model)
+        context = builder.build(node.id)
+        node_title = node.title or builder.labels.get(node.id)
+        message = cls._create_message(node, node_title, context, instruction)
+        return cls._create_chat_messages(message)
 
     @staticmethod
     def _create_message(
-        node: Node, nodes: List[Dict[str, Any]], instruction: Optional[str]
+        node: Node, node_title: str, context: str, instruction: Optional[str]
     ) -> str:
-        flow_data = json.loads(node.flow_data)
-        node_title = node.title or flow_data["data"]["label"]
-
         default_message = f"""
-        I want to create a note & here's the whole content structure.
+        I want to create a note & here's the surrounding content structure.
 
-        {nodes}
+        {context}
 
         **I'm currently thinking about a topic with a title '{node_title}' & node id '{node.id}'**
 
@@ -84,58 +120,68 @@ class NodeNoteGenerator:
         ]
 
     @classmethod
-    def _run_chat_stream(
+    async def _run_chat_stream(
         cls,
-        node_id: int,
+        job_id: str,
+        open_sink: Callable[[], Any],
         messages: List[Dict[str, str]],
         ai_key: Optional[str],
         ai_model: Optional[str],
+        force: bool = False,
     ):
+        sink = open_sink()
+        error = None
+        cache = get_generation_cache()
+        cache_key = generation_cache_key("note", ai_model, messages)
         try:
-            OpenaiUtil.chat_stream(
-                messages=messages,
-                on_stream=lambda result: cls._send_stream_result(node_id, result),
-                api_key=ai_key,
-                model=ai_model,
-            )
+            await sync_to_async(cls._mark_running)(job_id)
+            cached = None if force or cache is None else await cache.aget(cache_key)
+            if cached is not None:
+                await sink.push(cached["response"])
+                result = {
+                    **cached,
+                    "token_usage": {**cached["token_usage"], "cached": True},
+                }
+            else:
+                result = await OpenaiUtil.achat_stream(
+                    messages=messages,
+                    on_stream=sink.push,
+                    api_key=ai_key,
+                    model=ai_model,
+                )
+                if cache is not None:
+                    await cache.aset(cache_key, result)
+            await sync_to_async(cls._save_note)(job_id, result)
         except Exception as e:
-            print(f"Error in chat_stream: {str(e)}")
+            error = str(e)
+            logger.exception("Error in chat_stream for note generation %s", job_id)
+            await sync_to_async(cls._mark_failed)(job_id, error)
         finally:
-            cls._send_finished_notification(node_id)
+            await sink.finish(error)
 
-    @classmethod
-    def _send_stream_result(cls, node_id: int, result: str):
-        cls._send_socket_request(
-            action="notaminda-node-auto-generate-note",
-            dataset_id=node_id,
-            data={"reply": result},
-        )
-
-    @classmethod
-    def _send_finished_notification(cls, node_id: int):
-        cls._send_socket_request(
-            action="notaminda-node-auto-generate-note-finished", dataset_id=node_id
-        )
+    @staticmethod
+    def _mark_running(job_id: str):
+        close_old_connections()
+        NoteGeneration.objects.filter(pk=job_id).update(status=NoteGeneration.RUNNING)
 
-    @classmethod
-    def _send_socket_request(
-        cls, action: str, dataset_id: int, data: Optional[Dict[str, Any]] = None
-    ):
-        try:
-            payload = {
-                "isSuccess": True,
-                "action": action,
-                "datasetId": dataset_id,
-            }
-            if data:
-                payload["data"] = data
-
-            response = requests.post(
-                SOCKET_URL,
-                json=payload,
-                headers={"Content-Type": "application/json"},
-                timeout=5,
+    @staticmethod
+    def _save_note(job_id: str, result: Dict[str, Any]):
+        close_old_connections()
+        job = NoteGeneration.objects.select_related("node").get(pk=job_id)
+        with transaction.atomic():
+            Node.objects.filter(pk=job.node_id).update(
+                note=result["response"], note_token_usage=result["token_usage"]
             )
-            response.raise_for_status()
-        except requests.RequestException as e:
-            print(f"Error sending socket request: {str(e)}")
+            NoteGeneration.objects.filter(pk=job_id).update(
+                status=NoteGeneration.COMPLETED,
+                token_usage=result["token_usage"],
+                finished_at=timezone.now(),
+            )
+            MindMap.bump_version(job.node.mind_map_id)
+
+    @staticmethod
+    def _mark_failed(job_id: str, error: str):
+        close_old_connections()
+        NoteGeneration.objects.filter(pk=job_id).update(
+            status=NoteGeneration.FAILED, error=error, finished_at=timezone.now()
+        )
@@ -0,0 +1,198 @@
+import asyncio
+import atexit
+import concurrent.futures
+import logging
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Awaitable, Callable, Dict
+
+from django.conf import settings
+from rest_framework import status
+from rest_framework.exceptions import APIException, Throttled
+
+logger = logging.getLogger(__name__)
+
+
+class GenerationQueueFull(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "Too many generations are queued, please try again shortly."
+    default_code = "generation_queue_full"
+
+
+class GenerationRunner:
+    # One background event loop per process; every job is a task on it.
+    def __init__(
+        self,
+        max_concurrency: int = 100,
+        max_queue_size: int = 500,
+        max_per_user: int = 3,
+        drain_timeout: float = 30,
+    ):
+        self.max_concurrency = max_concurrency
+        self.max_queue_size = max_queue_size
+        self.max_per_user = max_per_user
+        self.drain_timeout = drain_timeout
+
+        self._lock = threading.Lock()
+        self._loop = None
+        self._thread = None
+        self._queue = None
+        self._slots = None
+        self._tasks = set()
+        self._accepting = True
+        self._queued = 0
+        self._running = 0
+        self._user_jobs: Dict[Any, int] = defaultdict(int)
+        self._counters = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "cancelled": 0,
+            "rejected": 0,
+        }
+
+    @classmethod
+    def from_settings(cls) -> "GenerationRunner":
+        config = settings.GENERATION_RUNNER
+        return cls(
+            max_concurrency=config["MAX_CONCURRENCY"],
+            max_queue_size=config["MAX_QUEUE_SIZE"],
+            max_per_user=config["MAX_PER_USER"],
+            drain_timeout=config["DRAIN_TIMEOUT"],
+        )
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        self._ensure_started()
+        return self._loop
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is not None:
+                return
+            ready = threading.Event()
+            self._loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(
+                target=self._run_loop, args=(ready,), name="generation-runner"
+            )
+            self._thread.daemon = True
+            self._thread.start()
+            ready.wait()
+            atexit.register(self.shutdown)
+
+    def _run_loop(self, ready: threading.Event):
+        asyncio.set_event_loop(self._loop)
+        self._queue = asyncio.Queue()
+        self._slots = asyncio.Semaphore(self.max_concurrency)
+        self._loop.create_task(self._dispatch())
+        ready.set()
+        self._loop.run_forever()
+
+    def submit(
+        self, user_id, job: Callable[[], Awaitable[Any]]
+    ) -> concurrent.futures.Future:
+        self._ensure_started()
+        with self._lock:
+            if not self._accepting or self._queued >= self.max_queue_size:
+                self._counters["rejected"] += 1
+                raise GenerationQueueFull()
+            if self._user_jobs.get(user_id, 0) >= self.max_per_user:
+                self._counters["rejected"] += 1
+                raise Throttled(
+                    detail="You already have the maximum number of generations running."
+                )
+            self._user_jobs[user_id] += 1
+            self._queued += 1
+            self._counters["submitted"] += 1
+        future = concurrent.futures.Future()
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, (user_id, job, future))
+        return future
+
+    async def _dispatch(self):
+        while True:
+            await self._slots.acquire()
+            user_id, job, future = await self._queue.get()
+            with self._lock:
+                self._queued -= 1
+                self._running += 1
+            task = self._loop.create_task(self._run(user_id, job, future))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(
+        self,
+        user_id,
+        job: Callable[[], Awaitable[Any]],
+        future: concurrent.futures.Future,
+    ):
+        outcome = "completed"
+        try:
+            # The caller may have cancelled the future while it was queued;
+            # once running it can no longer be cancelled from outside.
+            if not future.set_running_or_notify_cancel():
+                outcome = "cancelled"
+                return
+            result = await job()
+        except asyncio.CancelledError:
+            outcome = "failed"
+            future.set_exception(concurrent.futures.CancelledError())
+            raise
+        except Exception as e:
+            outcome = "failed"
+            logger.exception("Generation job failed")
+            future.set_exception(e)
+        else:
+            future.set_result(result)
+        finally:
+            with self._lock:
+                self._running -= 1
+                self._counters[outcome] += 1
+                self._user_jobs[user_id] -= 1
+                if not self._user_jobs[user_id]:
+                    del self._user_jobs[user_id]
+            self._slots.release()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "queued": self._queued,
+                "running": self._running,
+                "active_users": len(self._user_jobs),
+                "max_concurrency": self.max_concurrency,
+                "max_queue_size": self.max_queue_size,
+                **self._counters,
+            }
+
+    def shutdown(self, timeout: float = None):
+        if self._thread is None or not self._thread.is_alive():
+            return
+        with self._lock:
+            self._accepting = False
+
+        deadline = time.monotonic() + (
+            self.drain_timeout if timeout is None else timeout
+        )
+        while time.monotonic() < deadline:
+            with self._lock:
+                if not self._queued and not self._running:
+                    break
+            time.sleep(0.05)
+        else:
+            logger.warning(
+                "Generation runner stopped with jobs pending: %s", self.stats()
+            )
+
+        async def cancel_tasks():
+            for task in asyncio.all_tasks():
+                if task is not asyncio.current_task():
+                    task.cancel()
+
+        asyncio.run_coroutine_threadsafe(cancel_tasks(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+
+
+generation_runner = GenerationRunner.from_settings()
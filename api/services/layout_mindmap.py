@@ -0,0 +1,93 @@
+import math
+from collections import defaultdict
+from typing import Any, Dict, Optional
+
+from django.db import transaction
+from rest_framework.exceptions import ValidationError
+
+from ..models import MindMap, Node
+from ..utils.flow_data import FLOW_DATA_COLUMNS, flow_data_columns, load_flow_data
+from ..utils.tree_layout import radial_layout, tidy_tree_layout
+
+
+class LayoutMindMap:
+    @staticmethod
+    def _position(flow_data) -> tuple:
+        position = (flow_data or {}).get("position") or {}
+        return position.get("x", 0), position.get("y", 0)
+
+    @classmethod
+    @transaction.atomic
+    def run(
+        cls,
+        mind_map,
+        algorithm: str = "tidy",
+        root_id: Optional[str] = None,
+        level_spacing: Optional[float] = None,
+        sibling_spacing: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        flow_data = {}
+        children = defaultdict(list)
+        roots = []
+
+        for node_id, parent_id, data in Node.objects.filter(
+            mind_map=mind_map
+        ).values_list("id", "parent_id", "flow_data"):
+            node_id = str(node_id)
+            flow_data[node_id] = load_flow_data(data)
+            if parent_id is None:
+                roots.append(node_id)
+            else:
+                children[str(parent_id)].append(node_id)
+
+        root_id = root_id or mind_map.root_node_id or (roots[0] if roots else None)
+        root_id = str(root_id) if root_id else None
+        if root_id not in flow_data:
+            raise ValidationError({"root": [f"Node '{root_id}' does not exist."]})
+
+        # Keep the user's current ordering of siblings.
+        for parent_id, kids in children.items():
+            if algorithm == "radial":
+                px, py = cls._position(flow_data[parent_id])
+                kids.sort(
+                    key=lambda kid: math.atan2(
+                        cls._position(flow_data[kid])[1] - py,
+                        cls._position(flow_data[kid])[0] - px,
+                    )
+                )
+            else:
+                kids.sort(key=lambda kid: cls._position(flow_data[kid])[::-1])
+
+        options = {}
+        if level_spacing:
+            options["level_spacing"] = level_spacing
+        if algorithm == "radial":
+            positions = radial_layout(children, root_id, **options)
+        else:
+            if sibling_spacing:
+                options["sibling_spacing"] = sibling_spacing
+            positions = tidy_tree_layout(children, root_id, **options)
+
+        anchor_x, anchor_y = cls._position(flow_data[root_id])
+        nodes_to_update = []
+        result = {}
+        for node_id, (x, y) in positions.items():
+            data = flow_data[node_id]
+            if not isinstance(data, dict):
+                continue
+            position = {"x": round(anchor_x + x, 2), "y": round(anchor_y + y, 2)}
+            data["position"] = position
+            result[node_id] = position
+            nodes_to_update.append(
+                Node(id=node_id, flow_data=data, **flow_data_columns(data))
+            )
+
+        Node.objects.bulk_update(
+            nodes_to_update,
+            fields=["flow_data", *FLOW_DATA_COLUMNS],
+            batch_size=1000,
+        )
+        if nodes_to_update:
+            MindMap.bump_version(mind_map.id)
+
+        return {"updated": len(nodes_to_update), "positions": result}
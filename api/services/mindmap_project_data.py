@@ -0,0 +1,109 @@
+import json
+import uuid
+from typing import Any, Dict, Iterator, Optional
+
+from django.db.models import F, TextField
+from django.db.models.functions import Cast
+from rest_framework.utils.encoders import JSONEncoder
+
+from ..models import Node
+
+ROOT_ID = "root"
+CHUNK_SIZE = 64 * 1024
+ROW_BATCH_SIZE = 2000
+RELATIONSHIP_NAMESPACE = uuid.UUID("3218e4d1-deee-4dd4-aa88-50c2ae2ff549")
+
+_encode = JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+
+
+def relationship_id(source, target) -> str:
+    return str(uuid.uuid5(RELATIONSHIP_NAMESPACE, f"{source}->{target}"))
+
+
+class MindMapProjectData:
+    @staticmethod
+    def _rows(mind_map):
+        # Root first, so it leads the payload; ordering by id too keeps the
+        # output byte-identical across reads.
+        # flow_data is read as raw JSON text so it can be spliced without decoding.
+        return (
+            Node.objects.filter(mind_map=mind_map)
+            .order_by(F("parent_id").asc(nulls_first=True), "id")
+            .values_list("id", "parent_id", Cast("flow_data", TextField()))
+            .iterator(chunk_size=ROW_BATCH_SIZE)
+        )
+
+    @staticmethod
+    def _flow_data_json(raw: Optional[str]) -> str:
+        if not raw or raw == "null":
+            return "null"
+        if raw[0] == '"':
+            # Legacy row holding JSON text inside a JSON string; text that does
+            # not decode is dropped rather than spliced into the document.
+            value = raw
+            try:
+                while isinstance(value, str):
+                    value = json.loads(value)
+            except json.JSONDecodeError:
+                return "null"
+            return _encode(value)
+        return raw
+
+    @classmethod
+    def iter_json(cls, mind_map) -> Iterator[str]:
+        buffer = ['{"nodes":[']
+        size = 0
+        relationships = []
+        root_id = str(mind_map.root_node_id) if mind_map.root_node_id else None
+
+        for index, (node_id, parent_id, flow_data) in enumerate(cls._rows(mind_map)):
+            node_id = str(node_id)
+            if root_id is None and index == 0 and parent_id is None:
+                root_id = node_id
+
+            public_id = ROOT_ID if node_id == root_id else node_id
+            if parent_id is None:
+                public_parent_id = None
+            elif str(parent_id) == root_id:
+                public_parent_id = ROOT_ID
+            else:
+                public_parent_id = str(parent_id)
+            relationships.append((public_parent_id, public_id))
+
+            piece = (
+                f'{"," if index else ""}{{"dbId":{_encode(node_id)},'
+                f'"id":{_encode(public_id)},"parent_id":{_encode(public_parent_id)},'
+                f'"flow_data":{cls._flow_data_json(flow_data)}}}'
+            )
+            buffer.append(piece)
+            size += len(piece)
+            if size >= CHUNK_SIZE:
+                yield "".join(buffer)
+                buffer = []
+                size = 0
+
+        buffer.append('],"relationships":[')
+        for index, (source, target) in enumerate(relationships):
+            piece = (
+                f'{"," if index else ""}{{"id":"{relationship_id(source, target)}",'
+                f'"source":{_encode(source)},"target":{_encode(target)}}}'
+            )
+            buffer.append(piece)
+            size += len(piece)
+            if size >= CHUNK_SIZE:
+                yield "".join(buffer)
+                buffer = []
+                size = 0
+
+        buffer.append("]}")
+        yield "".join(buffer)
+
+    @classmethod
+    def iter_document(cls, mind_map, head: Dict[str, Any]) -> Iterator[str]:
+        yield f'{_encode(head)[:-1]},"project_data":'
+        yield from cls.iter_json(mind_map)
+        yield "}"
+
+    @classmethod
+    def build(cls, mind_map) -> Dict[str, Any]:
+        return json.loads("".join(cls.iter_json(mind_map)))
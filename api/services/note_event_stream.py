@@ -0,0 +1,94 @@
+import asyncio
+import hashlib
+import json
+import queue
+from typing import Any, Dict, Optional
+
+
+class NoteEventStream:
+    # Server-Sent Events for one note generation. The generation job pushes from
+    # the runner loop; the response iterates from the request thread, or from
+    # the server's loop under ASGI. A client that goes away only stops the
+    # events: the note is still generated and saved.
+    def __init__(self, heartbeat: float = 15):
+        self.heartbeat = heartbeat
+        self.job_id = None
+        self.cancelled = False
+        self._events = queue.Queue()
+        self._latest = ""
+        self._waiter = None
+
+    @staticmethod
+    def _format(event: str, data: Dict[str, Any]) -> bytes:
+        return f"event: {event}\ndata: {json.dumps(data)}\n\n".encode()
+
+    def _put(self, event: Optional[bytes]):
+        self._events.put(event)
+        waiter = self._waiter
+        if waiter is not None:
+            loop, signal = waiter
+            loop.call_soon_threadsafe(signal.set)
+
+    async def push(self, text: str):
+        offset = len(self._latest)
+        self._latest = text
+        if not self.cancelled:
+            self._put(self._format("token", {"delta": text[offset:], "offset": offset}))
+
+    async def finish(self, error: Optional[str] = None):
+        if error:
+            self._put(self._format("error", {"detail": "Failed to generate the note."}))
+        else:
+            self._put(
+                self._format(
+                    "done",
+                    {
+                        "length": len(self._latest),
+                        "checksum": hashlib.sha256(self._latest.encode()).hexdigest(),
+                    },
+                )
+            )
+        self._put(None)
+
+    def __iter__(self):
+        try:
+            if self.job_id:
+                yield self._format("job", {"id": self.job_id})
+            while True:
+                try:
+                    event = self._events.get(timeout=self.heartbeat)
+                except queue.Empty:
+                    yield b": keep-alive\n\n"
+                    continue
+                if event is None:
+                    return
+                yield event
+        finally:
+            self.cancelled = True
+
+    async def __aiter__(self):
+        signal = asyncio.Event()
+        self._waiter = (asyncio.get_running_loop(), signal)
+        try:
+            if self.job_id:
+                yield self._format("job", {"id": self.job_id})
+            while True:
+                try:
+                    event = self._events.get_nowait()
+                except queue.Empty:
+                    signal.clear()
+                    if not self._events.empty():
+                        continue
+                    try:
+                        await asyncio.wait_for(signal.wait(), self.heartbeat)
+                    except asyncio.TimeoutError:
+                        yield b": keep-alive\n\n"
+                    continue
+                if event is None:
+                    return
+                yield event
+        finally:
+            self.cancelled = True
+
+    def close(self):
+        self.cancelled = True
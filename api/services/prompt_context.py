@@ -0,0 +1,118 @@
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+
+from ..models import Node
+from ..utils.token_accounting import count_text_tokens
+
+
+class PromptContextBuilder:
+    # Describes the map around one node as an indented outline: the path from
+    # the root, then the node's children, siblings and further descendants up
+    # to descendant_depth, added in that order until token_budget is spent.
+    def __init__(
+        self,
+        labels: Dict[str, str],
+        parents: Dict[str, Optional[str]],
+        model: Optional[str] = None,
+        token_budget: int = None,
+        descendant_depth: int = None,
+    ):
+        config = settings.PROMPT_CONTEXT
+        self.labels = labels
+        self.parents = parents
+        self.model = model
+        self.token_budget = token_budget or config["TOKEN_BUDGET"]
+        self.descendant_depth = (
+            config["DESCENDANT_DEPTH"] if descendant_depth is None else descendant_depth
+        )
+        self.children = defaultdict(list)
+        for node_id, parent_id in parents.items():
+            if parent_id is not None:
+                self.children[parent_id].append(node_id)
+
+    @classmethod
+    def for_mind_map(cls, mind_map_id, **kwargs) -> "PromptContextBuilder":
+        labels = {}
+        parents = {}
+        rows = Node.objects.filter(mind_map_id=mind_map_id).values_list(
+            "id", "parent_id", "label", "title"
+        )
+        for node_id, parent_id, label, title in rows.order_by("created_at", "id"):
+            labels[node_id] = label or title or ""
+            parents[node_id] = parent_id
+        return cls(labels, parents, **kwargs)
+
+    def _ancestors(self, node_id) -> List[str]:
+        path = []
+        seen = set()
+        current = self.parents.get(node_id)
+        while current is not None and current not in seen:
+            seen.add(current)
+            path.append(current)
+            current = self.parents.get(current)
+        path.reverse()
+        return path
+
+    def _neighbours(self, node_id) -> List[str]:
+        # Direct children first (they are what new children must not repeat),
+        # then siblings, then deeper descendants level by level.
+        level = list(self.children[node_id]) if self.descendant_depth else []
+        neighbours = list(level)
+        parent_id = self.parents.get(node_id)
+        if parent_id is not None:
+            neighbours += [
+                sibling for sibling in self.children[parent_id] if sibling != node_id
+            ]
+
+        for _ in range(self.descendant_depth - 1):
+            level = [child for parent in level for child in self.children[parent]]
+            neighbours += level
+        return neighbours
+
+    def _line(self, node_id, depth: int, focus_id) -> str:
+        marker = " (current)" if node_id == focus_id else ""
+        return f"{'  ' * depth}- {self.labels.get(node_id, '')}{marker}"
+
+    def build(self, node_id) -> str:
+        if node_id not in self.parents:
+            return ""
+
+        # The path to the node is always kept; the budget decides how much of
+        # the neighbourhood follows. A node is only added under a kept parent,
+        # and nodes on the path note how many of their children were left out.
+        path = self._ancestors(node_id) + [node_id]
+        depths = {current: depth for depth, current in enumerate(path)}
+        used = sum(
+            count_text_tokens(self.model, self._line(current, depth, node_id))
+            for current, depth in depths.items()
+        )
+        for candidate in self._neighbours(node_id):
+            if used >= self.token_budget:
+                break
+            parent_id = self.parents[candidate]
+            if parent_id not in depths:
+                continue
+            depth = depths[parent_id] + 1
+            cost = count_text_tokens(self.model, self._line(candidate, depth, node_id))
+            if used + cost > self.token_budget:
+                continue
+            depths[candidate] = depth
+            used += cost
+
+        path_set = set(path)
+        lines = []
+        stack: List[Tuple[Optional[str], int, int]] = [(path[0], 0, 0)]
+        while stack:
+            current, depth, omitted = stack.pop()
+            if current is None:
+                lines.append(f"{'  ' * depth}- ... {omitted} more")
+                continue
+            lines.append(self._line(current, depth, node_id))
+            children = self.children[current]
+            kept = [child for child in children if child in depths]
+            if current in path_set and len(kept) < len(children):
+                stack.append((None, depth + 1, len(children) - len(kept)))
+            stack.extend((child, depth + 1, 0) for child in reversed(kept))
+        return "\n".join(lines)
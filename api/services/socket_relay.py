@@ -0,0 +1,159 @@
+import asyncio
+import hashlib
+import logging
+import os
+import time
+from typing import Any, Dict, Optional
+
+import httpx
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+SOCKET_URL = os.environ.get("SOCKET_URL")
+
+
+class SocketRelay:
+    def __init__(
+        self,
+        url: Optional[str],
+        mode: str = "full",
+        flush_interval: float = 0.1,
+        max_batch_bytes: int = 1024,
+        timeout: float = 5,
+        max_connections: int = 20,
+    ):
+        self.url = url
+        self.mode = mode
+        self.flush_interval = flush_interval
+        self.max_batch_bytes = max_batch_bytes
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self._client = None
+
+    @classmethod
+    def from_settings(cls) -> "SocketRelay":
+        config = settings.SOCKET_RELAY
+        return cls(
+            SOCKET_URL,
+            mode=config["MODE"],
+            flush_interval=config["FLUSH_INTERVAL_MS"] / 1000,
+            max_batch_bytes=config["MAX_BATCH_BYTES"],
+            timeout=config["TIMEOUT"],
+            max_connections=config["MAX_CONNECTIONS"],
+        )
+
+    def _get_client(self) -> httpx.AsyncClient:
+        # Created on first use so it belongs to the loop that uses it.
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+            )
+        return self._client
+
+    async def send(
+        self, action: str, dataset_id, data: Optional[Dict[str, Any]] = None
+    ):
+        if not self.url:
+            return
+        payload = {"isSuccess": True, "action": action, "datasetId": dataset_id}
+        if data:
+            payload["data"] = data
+        try:
+            response = await self._get_client().post(self.url, json=payload)
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            logger.warning("Error sending socket request: %s", e)
+
+    def open_stream(
+        self, action: str, finished_action: str, dataset_id
+    ) -> "RelayStream":
+        return RelayStream(self, action, finished_action, dataset_id)
+
+
+class RelayStream:
+    # Producers only record the latest text; one pump task sends it at most every
+    # flush_interval (sooner once max_batch_bytes of new text piles up), with a
+    # single request in flight, so a slow socket server never stalls the model.
+    # In "delta" mode each update carries only the text added since the last one,
+    # and the finished message carries the full text, its checksum and the seq
+    # of the last update (updates are numbered from 1; 0 means none was sent).
+    def __init__(
+        self, relay: SocketRelay, action: str, finished_action: str, dataset_id
+    ):
+        self.relay = relay
+        self.action = action
+        self.finished_action = finished_action
+        self.dataset_id = dataset_id
+        self._pending: Optional[str] = None
+        self._latest = ""
+        self._seq = 0
+        self._sent_length = 0
+        self._sent_at = 0.0
+        self._wake = asyncio.Event()
+        self._closing = asyncio.Event()
+        self._task = asyncio.get_running_loop().create_task(self._pump())
+
+    async def push(self, text: str):
+        self._pending = text
+        self._latest = text
+        self._wake.set()
+
+    async def _pump(self):
+        while True:
+            await self._wake.wait()
+            self._wake.clear()
+
+            delay = self._sent_at + self.relay.flush_interval - time.monotonic()
+            if (
+                delay > 0
+                and not self._closing.is_set()
+                and self._pending is not None
+                and len(self._pending) - self._sent_length < self.relay.max_batch_bytes
+            ):
+                try:
+                    await asyncio.wait_for(self._closing.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+
+            text, self._pending = self._pending, None
+            if text is not None:
+                self._seq += 1
+                data = self._update_data(text)
+                self._sent_at = time.monotonic()
+                self._sent_length = len(text)
+                await self.relay.send(self.action, self.dataset_id, data)
+
+            if self._closing.is_set() and self._pending is None:
+                return
+
+    def _update_data(self, text: str) -> Dict[str, Any]:
+        if self.relay.mode != "delta":
+            return {"reply": text}
+        return {
+            "delta": text[self._sent_length :],
+            "offset": self._sent_length,
+            "seq": self._seq,
+        }
+
+    async def finish(self, error: Optional[str] = None):
+        self._closing.set()
+        self._wake.set()
+        await self._task
+
+        data = None
+        if self.relay.mode == "delta":
+            data = {
+                "reply": self._latest,
+                "length": len(self._latest),
+                "checksum": hashlib.sha256(self._latest.encode()).hexdigest(),
+                "seq": self._seq,
+            }
+        await self.relay.send(self.finished_action, self.dataset_id, data)
+
+
+socket_relay = SocketRelay.from_settings()
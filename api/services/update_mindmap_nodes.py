@@ -1,49 +1,110 @@
+from typing import Dict, Optional
+
 from django.db import transaction
-from ..models import Node
+from django.db.models import TextField
+from django.db.models.functions import Cast, Left
+from rest_framework.exceptions import ValidationError
+
+from ..models import MindMap, Node
+from ..utils.flow_data import FLOW_DATA_COLUMNS, flow_data_columns
+from ..utils.node_order import parents_first
 
 
 class UpdateMindMapNodes:
     @staticmethod
     @transaction.atomic
-    def run(mind_map, nodes_data):
+    def run(mind_map, nodes_data) -> Dict[str, int]:
+        # Legacy rows hold flow_data as a JSON string; their hash matches the
+        # decoded value, so they are flagged to be rewritten natively anyway.
         existing_nodes = {
-            str(node.id): node for node in mind_map.nodes.select_related("parent").all()
+            str(node_id): (
+                str(parent_id) if parent_id else None,
+                None if first_char == '"' else data_hash,
+            )
+            for node_id, parent_id, data_hash, first_char in mind_map.nodes.values_list(
+                "id",
+                "parent_id",
+                "flow_data_hash",
+                Left(Cast("flow_data", TextField()), 1),
+            )
+        }
+        known_ids = set(existing_nodes) | {
+            str(node_data.get("id")) for node_data in nodes_data
         }
-        new_nodes = {}
-        parent_updates = []
+        kept_ids = set()
+        final_parents = {}
+        nodes_to_create = {}
         nodes_to_update = []
-        nodes_to_create = []
+        nodes_to_move = []
 
         for node_data in nodes_data:
             node_id = str(node_data.get("id"))
             parent_id = node_data.pop("parent", None)
+            parent_id = str(parent_id) if parent_id else None
+            if parent_id not in known_ids:
+                parent_id = None
 
             if node_id in existing_nodes:
-                node = existing_nodes[node_id]
-                for attr, value in node_data.items():
-                    setattr(node, attr, value)
-                nodes_to_update.append(node)
-                del existing_nodes[node_id]
-            else:
-                node = Node(mind_map=mind_map, **node_data)
-                new_nodes[node_id] = node
-                nodes_to_create.append(node)
+                kept_ids.add(node_id)
+                current_parent_id, current_hash = existing_nodes[node_id]
+                final_parents[node_id] = parent_id or current_parent_id
+
+                if "flow_data" in node_data:
+                    columns = flow_data_columns(node_data["flow_data"])
+                    if columns["flow_data_hash"] != current_hash:
+                        nodes_to_update.append(
+                            Node(
+                                id=node_id,
+                                flow_data=node_data["flow_data"],
+                                **columns,
+                            )
+                        )
 
-            if parent_id:
-                parent_updates.append((node, parent_id))
+                if parent_id and parent_id != current_parent_id:
+                    nodes_to_move.append(Node(id=node_id, parent_id=parent_id))
+            else:
+                final_parents[node_id] = parent_id
+                nodes_to_create[node_id] = Node(
+                    mind_map=mind_map,
+                    parent_id=parent_id,
+                    **flow_data_columns(node_data.get("flow_data")),
+                    **node_data,
+                )
 
-        Node.objects.bulk_create(nodes_to_create)
-        Node.objects.bulk_update(nodes_to_update, fields=["flow_data"])
+        try:
+            ordered_nodes = parents_first(nodes_to_create)
+        except ValueError as e:
+            raise ValidationError(str(e))
 
-        parent_dict = {str(node.id): node for node in mind_map.nodes.all()}
-        for node, parent_id in parent_updates:
-            parent_node = parent_dict.get(parent_id)
-            if parent_node:
-                node.parent = parent_node
+        deleted_ids = set(existing_nodes) - kept_ids
 
+        Node.objects.bulk_create(ordered_nodes)
         Node.objects.bulk_update(
-            [node for node, _ in parent_updates], fields=["parent"]
+            nodes_to_update, fields=["flow_data", *FLOW_DATA_COLUMNS]
         )
-        Node.objects.filter(
-            id__in=[node.id for node in existing_nodes.values()]
-        ).delete()
+        Node.objects.bulk_update(nodes_to_move, fields=["parent"])
+        Node.objects.filter(id__in=deleted_ids).delete()
+        UpdateMindMapNodes._update_root(mind_map, final_parents)
+
+        changes = {
+            "created": len(nodes_to_create),
+            "updated": len(nodes_to_update),
+            "moved": len(nodes_to_move),
+            "deleted": len(deleted_ids),
+        }
+        if any(changes.values()):
+            MindMap.bump_version(mind_map.id)
+        return changes
+
+    @staticmethod
+    def _update_root(mind_map, parents: Dict[str, Optional[str]]):
+        # Keep the current root while it is still a root, otherwise point at
+        # whichever node is now parentless.
+        roots = [node_id for node_id, parent_id in parents.items() if not parent_id]
+        root_id = mind_map.root_node_id
+        if root_id is not None and str(root_id) in roots:
+            return
+        root_id = roots[0] if roots else None
+        if root_id != mind_map.root_node_id:
+            MindMap.objects.filter(pk=mind_map.pk).update(root_node_id=root_id)
+            mind_map.root_node_id = root_id
@@ -1,3 +1,213 @@
-from django.test import TestCase
+import copy
+import random
+import uuid
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase
+from rest_framework.exceptions import ValidationError
+
+from .models import MindMap, Node
+from .services.apply_mindmap_operations import (
+    ApplyMindMapOperations,
+    MindMapVersionConflict,
+)
+from .utils.generate_node_positions import (
+    resolve_collisions_grid,
+    resolve_collisions_naive,
+)
+from .utils.vectorized_layout import resolve_collisions_vectorized
+
+SOLVERS = [
+    resolve_collisions_naive,
+    resolve_collisions_grid,
+    resolve_collisions_vectorized,
+]
+
+
+def build_map(seed, size, children, with_ids):
+    rng = random.Random(seed)
+    existing_nodes = [
+        {
+            "id": f"node-{index}",
+            "position": {"x": rng.uniform(-400, 400), "y": rng.uniform(-400, 400)},
+            "width": rng.uniform(60, 200),
+            "height": rng.uniform(20, 60),
+        }
+        for index in range(size)
+    ]
+    new_nodes = []
+    for index in range(children):
+        node = {
+            "position": {"x": rng.uniform(-150, 150), "y": rng.uniform(-150, 150)},
+            "width": 100,
+            "height": 32,
+        }
+        if with_ids:
+            node["id"] = f"new-{index}"
+        new_nodes.append(node)
+    return existing_nodes + new_nodes, size
+
+
+def solve(solver, all_nodes, new_start):
+    all_nodes = copy.deepcopy(all_nodes)
+    solver(all_nodes[new_start:], all_nodes)
+    return [node["position"] for node in all_nodes]
+
+
+class CollisionSolverParityTests(SimpleTestCase):
+    def assert_parity(self, with_ids):
+        for seed in range(50):
+            rng = random.Random(seed)
+            all_nodes, new_start = build_map(
+                seed, rng.randint(0, 40), rng.randint(1, 10), with_ids
+            )
+            expected = solve(resolve_collisions_naive, all_nodes, new_start)
+            for solver in SOLVERS[1:]:
+                with self.subTest(seed=seed, solver=solver.__name__):
+                    self.assertEqual(solve(solver, all_nodes, new_start), expected)
+
+    def test_new_nodes_with_ids(self):
+        self.assert_parity(with_ids=True)
+
+    def test_new_nodes_without_ids(self):
+        self.assert_parity(with_ids=False)
+
+    def test_no_new_nodes(self):
+        all_nodes, new_start = build_map(0, 10, 0, with_ids=True)
+        for solver in SOLVERS:
+            self.assertEqual(
+                solve(solver, all_nodes, new_start),
+                [node["position"] for node in all_nodes],
+            )
+
+
+def flow_data(node_id, label):
+    return {
+        "id": node_id,
+        "type": "mindmap",
+        "data": {"label": label},
+        "position": {"x": 0, "y": 0},
+    }
+
+
+class ApplyMindMapOperationsTests(TestCase):
+    def setUp(self):
+        user = User.objects.create(username="operations")
+        self.mind_map = MindMap.objects.create(user=user, title="Operations")
+        # root -> a -> b, root -> c
+        self.root = self.add_node("root", None)
+        self.a = self.add_node("a", self.root)
+        self.b = self.add_node("b", self.a)
+        self.c = self.add_node("c", self.root)
+
+    def add_node(self, label, parent):
+        node_id = str(uuid.uuid4())
+        Node.objects.create(
+            id=node_id,
+            title=label,
+            mind_map=self.mind_map,
+            parent_id=parent,
+            flow_data=flow_data(node_id, label),
+        )
+        return node_id
+
+    def apply(self, operations, base_version=None):
+        return ApplyMindMapOperations.run(self.mind_map, operations, base_version)
+
+    def parents(self):
+        return {
+            node_id: parent_id
+            for node_id, parent_id in Node.objects.filter(
+                mind_map=self.mind_map
+            ).values_list("id", "parent_id")
+        }
+
+    def assert_rejected(self, operations, index, message):
+        with self.assertRaises(ValidationError) as raised:
+            self.apply(operations)
+        self.assertEqual(raised.exception.detail["operations"][index][0], message)
+
+    def test_move_then_delete_old_ancestor_keeps_moved_node(self):
+        result = self.apply(
+            [
+                {"op": "move", "id": self.b, "parent": self.c},
+                {"op": "delete", "id": self.a},
+            ]
+        )
+        self.assertEqual(
+            self.parents(), {self.root: None, self.b: self.c, self.c: self.root}
+        )
+        self.assertEqual((result["moved"], result["deleted"]), (1, 1))
+
+    def test_add_under_node_deleted_earlier_is_rejected(self):
+        new_id = str(uuid.uuid4())
+        for parent in (self.a, self.b):
+            with self.subTest(parent=parent):
+                self.assert_rejected(
+                    [
+                        {"op": "delete", "id": self.a},
+                        {
+                            "op": "add",
+                            "id": new_id,
+                            "parent": parent,
+                            "flow_data": flow_data(new_id, "new"),
+                        },
+                    ],
+                    1,
+                    f"Parent node '{parent}' does not exist.",
+                )
+        self.assertEqual(len(self.parents()), 4)
+
+    def test_delete_then_re_add_same_id(self):
+        result = self.apply(
+            [
+                {"op": "delete", "id": self.a},
+                {
+                    "op": "add",
+                    "id": self.a,
+                    "parent": self.c,
+                    "flow_data": flow_data(self.a, "a again"),
+                },
+            ]
+        )
+        # b was attached to the old a, so it goes with it.
+        self.assertEqual(
+            self.parents(), {self.root: None, self.a: self.c, self.c: self.root}
+        )
+        self.assertEqual(Node.objects.get(id=self.a).label, "a again")
+        self.assertEqual(result["created"], 1)
+
+    def test_move_under_descendant_is_rejected(self):
+        self.assert_rejected(
+            [{"op": "move", "id": self.a, "parent": self.b}],
+            0,
+            "A node cannot be moved under itself.",
+        )
+        self.assert_rejected(
+            [{"op": "move", "id": self.a, "parent": self.a}],
+            0,
+            "A node cannot be moved under itself.",
+        )
+
+    def test_root_cannot_be_moved_or_deleted(self):
+        for operation in (
+            {"op": "move", "id": self.root, "parent": self.c},
+            {"op": "delete", "id": self.root},
+        ):
+            with self.subTest(op=operation["op"]):
+                self.assert_rejected(
+                    [operation], 0, "The root node cannot be moved or deleted."
+                )
+        self.assertEqual(len(self.parents()), 4)
+
+    def test_stale_base_version_conflicts(self):
+        result = self.apply(
+            [{"op": "update", "id": self.c, "flow_data": flow_data(self.c, "c2")}],
+            base_version=1,
+        )
+        self.assertEqual(result["version"], 2)
+
+        with self.assertRaises(MindMapVersionConflict) as raised:
+            self.apply([{"op": "delete", "id": self.c}], base_version=1)
+        self.assertEqual(raised.exception.status_code, 409)
+        self.assertIn(self.c, self.parents())
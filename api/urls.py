@@ -3,32 +3,45 @@ from rest_framework.routers import DefaultRouter
 from .views import (
     MindMapViewSet,
     NodeViewSet,
+    NoteGenerationViewSet,
     PublicNodeViewSet,
     PublicMindMapViewSet,
     register_user,
     login_user,
     verify_ai_key,
+    generation_stats,
+    auto_generate_children,
+    auto_generate_children_batch,
+    auto_generate_note,
 )
 
 router = DefaultRouter()
 router.register(r"mindmaps", MindMapViewSet, basename="mindmap")
 router.register(r"nodes", NodeViewSet, basename="node")
+router.register(r"note-generations", NoteGenerationViewSet, basename="note_generation")
 router.register(r"public-mindmaps", PublicMindMapViewSet, basename="public_mindmap")
 router.register(r"public-nodes", PublicNodeViewSet, basename="public_node")
 
 urlpatterns = [
+    # Before the router, whose node detail route would otherwise match it.
+    path(
+        "nodes/auto-generate-children/",
+        auto_generate_children_batch,
+        name="node-auto-generate-children-batch",
+    ),
     path("", include(router.urls)),
     path("register/", register_user, name="register"),
     path("login/", login_user, name="login"),
     path("verify-ai-key/", verify_ai_key, name="verify_ai_key"),
+    path("generation-stats/", generation_stats, name="generation_stats"),
     path(
         "nodes/<str:pk>/auto-generate-children/",
-        NodeViewSet.as_view({"post": "auto_generate_children"}),
+        auto_generate_children,
         name="node-auto-generate-children",
     ),
     path(
         "nodes/<str:pk>/auto-generate-note/",
-        NodeViewSet.as_view({"post": "auto_generate_note"}),
+        auto_generate_note,
         name="node-auto-generate-note",
     ),
 ]
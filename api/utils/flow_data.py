@@ -0,0 +1,56 @@
+import hashlib
+import json
+from typing import Any, Dict, Optional
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+
+def flow_data_hash(flow_data: Any) -> Optional[str]:
+    if flow_data is None:
+        return None
+    if isinstance(flow_data, str):
+        try:
+            flow_data = json.loads(flow_data)
+        except json.JSONDecodeError:
+            pass
+    canonical = json.dumps(
+        flow_data, sort_keys=True, separators=(",", ":"), cls=DjangoJSONEncoder
+    )
+    return hashlib.blake2b(canonical.encode(), digest_size=16).hexdigest()
+
+
+def load_flow_data(flow_data: Any) -> Optional[Dict[str, Any]]:
+    if isinstance(flow_data, str):
+        try:
+            return json.loads(flow_data)
+        except json.JSONDecodeError:
+            return None
+    return flow_data
+
+
+FLOW_DATA_COLUMNS = ["flow_data_hash", "label", "x", "y", "width", "height"]
+
+
+def _number(value: Any) -> Optional[float]:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    return float(value)
+
+
+def flow_data_columns(flow_data: Any) -> Dict[str, Any]:
+    # The values Node keeps in columns next to flow_data, so readers can select
+    # a label or position without loading and parsing the whole blob.
+    data = load_flow_data(flow_data)
+    if not isinstance(data, dict):
+        data = {}
+    position = data.get("position") or {}
+    measured = data.get("measured") or {}
+    label = (data.get("data") or {}).get("label")
+    return {
+        "flow_data_hash": flow_data_hash(flow_data),
+        "label": label if isinstance(label, str) else None,
+        "x": _number(position.get("x")),
+        "y": _number(position.get("y")),
+        "width": _number(data.get("width", measured.get("width"))),
+        "height": _number(data.get("height", measured.get("height"))),
+    }
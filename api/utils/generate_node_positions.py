@@ -1,7 +1,13 @@
 import math
 
+from django.conf import settings
 
-def generate_node_positions(parent_node, new_nodes_count, existing_nodes):
+from .spatial_grid import SpatialGrid
+
+
+def generate_node_positions(parent_node, new_nodes_count, existing_nodes, ids=None):
+    # New nodes without ids are never tested against each other; pass ids to
+    # have siblings pushed apart too.
     new_nodes = []
     radius = 150
     angle_step = (2 * math.pi) / new_nodes_count
@@ -11,11 +17,29 @@ def generate_node_positions(parent_node, new_nodes_count, existing_nodes):
         x = parent_node["position"]["x"] + radius * math.cos(angle)
         y = parent_node["position"]["y"] + radius * math.sin(angle)
 
-        new_nodes.append({"position": {"x": x, "y": y}, "height": 32, "width": 100})
+        new_node = {"position": {"x": x, "y": y}, "height": 32, "width": 100}
+        if ids is not None:
+            new_node["id"] = ids[i]
+        new_nodes.append(new_node)
+
+    get_collision_solver()(new_nodes, existing_nodes + new_nodes)
+
+    return new_nodes
+
 
-    all_nodes = existing_nodes + new_nodes
+def get_collision_solver(name=None):
+    name = name or settings.LAYOUT_SOLVER
+    if name == "numpy":
+        from .vectorized_layout import resolve_collisions_vectorized
+
+        return resolve_collisions_vectorized
+    if name == "naive":
+        return resolve_collisions_naive
+    return resolve_collisions_grid
+
+
+def resolve_collisions_naive(new_nodes, all_nodes, max_iterations=100):
     iterations = 0
-    max_iterations = 100
 
     while iterations < max_iterations:
         has_collision = False
@@ -32,7 +56,50 @@ def generate_node_positions(parent_node, new_nodes_count, existing_nodes):
             break
         iterations += 1
 
-    return new_nodes
+
+def resolve_collisions_grid(new_nodes, all_nodes, max_iterations=100):
+    # Same visiting order as resolve_collisions_naive, but each new node is only
+    # tested against the nodes sharing a grid cell with it.
+    if not new_nodes:
+        return
+
+    cell_size = 2 * max(max(node["width"], node["height"]) for node in new_nodes)
+    grid = SpatialGrid(all_nodes, cell_size)
+    grid.cover(SpatialGrid.bounds(new_nodes))
+    indexes = {id(node): index for index, node in enumerate(all_nodes)}
+    iterations = 0
+
+    while iterations < max_iterations:
+        has_collision = False
+
+        for node in new_nodes:
+            node_id = node.get("id")
+            start = 0
+
+            while True:
+                collided = None
+                for j in sorted(j for j in grid.query(node) if j >= start):
+                    if node_id != all_nodes[j].get("id") and detect_collision(
+                        node, all_nodes[j]
+                    ):
+                        collided = j
+                        break
+
+                if collided is None:
+                    break
+
+                other = all_nodes[collided]
+                node_keys = grid.cell_keys(node)
+                other_keys = grid.cell_keys(other)
+                resolve_collision(node, other)
+                grid.move(indexes[id(node)], node_keys, node)
+                grid.move(collided, other_keys, other)
+                has_collision = True
+                start = collided + 1
+
+        if not has_collision:
+            break
+        iterations += 1
 
 
 def detect_collision(node1, node2):
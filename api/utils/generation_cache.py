@@ -0,0 +1,83 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+
+
+class LRUGenerationCache:
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def aget(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    async def aset(self, key: str, value: Any):
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class DjangoGenerationCache:
+    def __init__(self, alias: str, ttl: float):
+        self._cache = caches[alias]
+        self.ttl = ttl
+
+    async def aget(self, key: str) -> Optional[Any]:
+        return await self._cache.aget(key)
+
+    async def aset(self, key: str, value: Any):
+        await self._cache.aset(key, value, self.ttl)
+
+
+_generation_cache = None
+_generation_cache_lock = threading.Lock()
+
+
+def get_generation_cache():
+    # None unless GENERATION_CACHE is enabled.
+    global _generation_cache
+    config = settings.GENERATION_CACHE
+    if not config["ENABLED"]:
+        return None
+    if _generation_cache is None:
+        with _generation_cache_lock:
+            if _generation_cache is None:
+                if config["BACKEND"] == "django":
+                    _generation_cache = DjangoGenerationCache(
+                        config["ALIAS"], config["TTL"]
+                    )
+                else:
+                    _generation_cache = LRUGenerationCache(
+                        config["MAX_ENTRIES"], config["TTL"]
+                    )
+    return _generation_cache
+
+
+def generation_cache_key(
+    kind: str, model: Optional[str], messages: List[Dict[str, str]]
+) -> str:
+    # Whitespace is collapsed so prompt indentation changes keep their entries.
+    normalized = [
+        [message["role"], " ".join(message["content"].split())] for message in messages
+    ]
+    fingerprint = json.dumps([kind, model, normalized], separators=(",", ":"))
+    return f"generation:{hashlib.sha256(fingerprint.encode()).hexdigest()}"
@@ -21,4 +21,4 @@ class JSONFieldSerializer(serializers.Field):
                 return json.loads(data)
             except json.JSONDecodeError:
                 raise serializers.ValidationError("Invalid JSON data")
-        return json.dumps(data)
+        return data
@@ -0,0 +1,23 @@
+from typing import Dict, List
+
+
+def parents_first(nodes: Dict[str, object]) -> List[object]:
+    ordered = []
+    placed = set()
+
+    for node_id in nodes:
+        chain = []
+        seen = set()
+        current = node_id
+        while current in nodes and current not in placed:
+            if current in seen:
+                raise ValueError(f"Node '{current}' is its own ancestor.")
+            chain.append(current)
+            seen.add(current)
+            current = str(nodes[current].parent_id)
+
+        for chained_id in reversed(chain):
+            ordered.append(nodes[chained_id])
+            placed.add(chained_id)
+
+    return ordered
@@ -1,6 +1,8 @@
-from typing import List, Callable, Dict, Any
-from openai import OpenAI
-import tiktoken
+from typing import List, Callable, Dict, Any, Awaitable
+from .openai_clients import openai_clients
+from .token_accounting import build_usage, count_prompt_tokens
+
+STREAM_OPTIONS = {"include_usage": True}
 
 
 class OpenaiUtil:
@@ -13,69 +15,99 @@ class OpenaiUtil:
         openai_config: Dict[str, Any] = {},
         model: str = None,
     ) -> Dict[str, Any]:
-        client = OpenAI(api_key=api_key)
+        client = openai_clients.get(api_key)
         stream = client.chat.completions.create(
             model=model,
             messages=messages,
             temperature=0.4,
             stream=True,
-            **openai_config,
+            **{"stream_options": STREAM_OPTIONS, **openai_config},
         )
 
         buffer = ""
         chunk_count = 0
         result = ""
-        result_total_token_count = 0
+        usage = None
 
+        # With include_usage the last chunk has no choices and carries the usage,
+        # so the stream is read to the end rather than stopping at finish_reason.
         for chunk in stream:
-            if chunk.choices[0].finish_reason == "stop":
-                if buffer:
+            if chunk.usage is not None:
+                usage = chunk.usage
+            if not chunk.choices:
+                continue
+
+            token = chunk.choices[0].delta.content
+            if token:
+                buffer += token
+                chunk_count += 1
+
+                if chunk_count == buffer_size:
                     result += buffer
+                    buffer = ""
+                    chunk_count = 0
                     on_stream(result)
 
-                prompt_tokens = OpenaiUtil.count_tokens(model, messages)
-                completion_tokens = result_total_token_count
-
-                return {
-                    "response": result,
-                    "token_usage": {
-                        "prompt_tokens": prompt_tokens,
-                        "completion_tokens": completion_tokens,
-                        "total_tokens": prompt_tokens + completion_tokens,
-                    },
-                }
-            else:
-                token = chunk.choices[0].delta.content
-                if token:
-                    buffer += token
-                    chunk_count += 1
-                    result_total_token_count += 1
-
-                    if chunk_count == buffer_size:
-                        result += buffer
-                        buffer = ""
-                        chunk_count = 0
-                        on_stream(result)
+        if buffer:
+            result += buffer
+            on_stream(result)
+
+        return {
+            "response": result,
+            "token_usage": build_usage(model, messages, result, usage),
+        }
+
+    @staticmethod
+    async def achat_stream(
+        api_key: str = None,
+        buffer_size: int = 3,
+        messages: List[Dict[str, str]] = [],
+        on_stream: Callable[[str], Awaitable[None]] = None,
+        openai_config: Dict[str, Any] = {},
+        model: str = None,
+    ) -> Dict[str, Any]:
+        client = openai_clients.get_async(api_key)
+        stream = await client.chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=0.4,
+            stream=True,
+            **{"stream_options": STREAM_OPTIONS, **openai_config},
+        )
+
+        buffer = ""
+        chunk_count = 0
+        result = ""
+        usage = None
+
+        async for chunk in stream:
+            if chunk.usage is not None:
+                usage = chunk.usage
+            if not chunk.choices:
+                continue
+
+            token = chunk.choices[0].delta.content
+            if token:
+                buffer += token
+                chunk_count += 1
+
+                if chunk_count == buffer_size:
+                    result += buffer
+                    buffer = ""
+                    chunk_count = 0
+                    if on_stream:
+                        await on_stream(result)
+
+        if buffer:
+            result += buffer
+            if on_stream:
+                await on_stream(result)
 
         return {
-            "response": result + buffer,
-            "token_usage": {
-                "prompt_tokens": OpenaiUtil.count_tokens(model, messages),
-                "completion_tokens": result_total_token_count,
-                "total_tokens": OpenaiUtil.count_tokens(model, messages)
-                + result_total_token_count,
-            },
+            "response": result,
+            "token_usage": build_usage(model, messages, result, usage),
         }
 
     @staticmethod
     def count_tokens(model, messages: List[Dict[str, str]]) -> int:
-        encoding = tiktoken.encoding_for_model(model)
-        num_tokens = 0
-        for message in messages:
-            num_tokens += 4
-            for key, value in message.items():
-                num_tokens += len(encoding.encode(value))
-                if key == "name":
-                    num_tokens -= 1
-        num_tokens += 2
-        return num_tokens
+        return count_prompt_tokens(model, messages)
@@ -0,0 +1,137 @@
+import asyncio
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+import httpx
+from django.conf import settings
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient, DefaultHttpxClient, OpenAI
+
+
+class OpenAIClientRegistry:
+    # Long-lived clients keyed by (api key hash, base url), so repeated calls
+    # with the same key reuse pooled connections instead of new TLS handshakes.
+    # Async clients are also keyed by event loop, as their connections are bound
+    # to it. Evicted clients are closed after close_delay, once in-flight
+    # requests on them have had time to finish.
+    def __init__(
+        self,
+        max_clients: int = 256,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        keepalive_expiry: float = 30,
+        timeout: float = 60,
+        connect_timeout: float = 5,
+        max_retries: int = 2,
+        close_delay: float = 600,
+    ):
+        self.max_clients = max_clients
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.timeout = httpx.Timeout(timeout, connect=connect_timeout)
+        self.max_retries = max_retries
+        self.close_delay = close_delay
+        self._clients = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls) -> "OpenAIClientRegistry":
+        config = settings.OPENAI_CLIENTS
+        return cls(
+            max_clients=config["MAX_CLIENTS"],
+            max_connections=config["MAX_CONNECTIONS"],
+            max_keepalive_connections=config["MAX_KEEPALIVE_CONNECTIONS"],
+            keepalive_expiry=config["KEEPALIVE_EXPIRY"],
+            timeout=config["TIMEOUT"],
+            connect_timeout=config["CONNECT_TIMEOUT"],
+            max_retries=config["MAX_RETRIES"],
+            close_delay=config["CLOSE_DELAY"],
+        )
+
+    @staticmethod
+    def _key(api_key: Optional[str], base_url: Optional[str]):
+        key_hash = hashlib.sha256((api_key or "").encode()).hexdigest()
+        return key_hash, base_url or os.environ.get("OPENAI_BASE_URL")
+
+    def get(self, api_key: Optional[str], base_url: Optional[str] = None) -> OpenAI:
+        key = ("sync", None) + self._key(api_key, base_url)
+        return self._get_or_create(
+            key,
+            lambda: OpenAI(
+                api_key=api_key,
+                base_url=base_url,
+                timeout=self.timeout,
+                max_retries=self.max_retries,
+                http_client=DefaultHttpxClient(
+                    limits=self.limits, timeout=self.timeout
+                ),
+            ),
+        )
+
+    def get_async(
+        self, api_key: Optional[str], base_url: Optional[str] = None
+    ) -> AsyncOpenAI:
+        loop = asyncio.get_running_loop()
+        key = ("async", loop) + self._key(api_key, base_url)
+        return self._get_or_create(
+            key,
+            lambda: AsyncOpenAI(
+                api_key=api_key,
+                base_url=base_url,
+                timeout=self.timeout,
+                max_retries=self.max_retries,
+                http_client=DefaultAsyncHttpxClient(
+                    limits=self.limits, timeout=self.timeout
+                ),
+            ),
+        )
+
+    def _get_or_create(self, key, factory):
+        with self._lock:
+            client = self._clients.get(key)
+            if client is not None:
+                self._clients.move_to_end(key)
+                return client
+
+        # Built outside the lock; if another thread raced us, keep theirs.
+        client = factory()
+        with self._lock:
+            existing = self._clients.get(key)
+            if existing is not None:
+                self._clients.move_to_end(key)
+                self._retire(key, client)
+                return existing
+            self._clients[key] = client
+            while len(self._clients) > self.max_clients:
+                self._retire(*self._clients.popitem(last=False))
+        return client
+
+    def _retire(self, key, client):
+        if key[0] == "sync":
+            timer = threading.Timer(self.close_delay, client.close)
+            timer.daemon = True
+            timer.start()
+            return
+
+        loop = key[1]
+        if loop.is_closed():
+            return
+
+        def close_later():
+            loop.call_later(self.close_delay, lambda: loop.create_task(client.close()))
+
+        loop.call_soon_threadsafe(close_later)
+
+    def clear(self):
+        with self._lock:
+            clients, self._clients = self._clients, OrderedDict()
+        for key, client in clients.items():
+            self._retire(key, client)
+
+
+openai_clients = OpenAIClientRegistry.from_settings()
@@ -0,0 +1,97 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import caches
+
+
+class LRUPayloadCache:
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Tuple[Any, bytes]]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Tuple[Any, bytes]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, tag: Any, payload: bytes):
+        if len(payload) > self.max_bytes:
+            return
+        with self._lock:
+            self._pop(key)
+            self._entries[key] = (tag, payload)
+            self._size += len(payload)
+            while self._size > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._pop(key)
+
+    def _pop(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= len(entry[1])
+
+
+class DjangoPayloadCache:
+    def __init__(self, alias: str, timeout: Optional[int] = None):
+        self._cache = caches[alias]
+        self.timeout = timeout
+
+    def get(self, key: str) -> Optional[Tuple[Any, bytes]]:
+        return self._cache.get(key)
+
+    def set(self, key: str, tag: Any, payload: bytes):
+        self._cache.set(key, (tag, payload), self.timeout)
+
+    def delete(self, key: str):
+        self._cache.delete(key)
+
+
+_payload_cache = None
+_payload_cache_lock = threading.Lock()
+
+
+def get_payload_cache():
+    global _payload_cache
+    if _payload_cache is None:
+        with _payload_cache_lock:
+            if _payload_cache is None:
+                config = settings.MINDMAP_PAYLOAD_CACHE
+                if config["BACKEND"] == "django":
+                    _payload_cache = DjangoPayloadCache(
+                        config["ALIAS"], config.get("TIMEOUT")
+                    )
+                else:
+                    _payload_cache = LRUPayloadCache(config["MAX_BYTES"])
+    return _payload_cache
+
+
+def mindmap_payload_key(mind_map_id) -> str:
+    return f"mindmap-payload:{mind_map_id}"
+
+
+def get_mindmap_payload(mind_map) -> Optional[bytes]:
+    entry = get_payload_cache().get(mindmap_payload_key(mind_map.id))
+    if entry is not None and entry[0] == mind_map.version:
+        return entry[1]
+    return None
+
+
+def set_mindmap_payload(mind_map, payload: bytes):
+    if len(payload) <= settings.MINDMAP_PAYLOAD_CACHE["MAX_ITEM_BYTES"]:
+        get_payload_cache().set(
+            mindmap_payload_key(mind_map.id), mind_map.version, payload
+        )
+
+
+def invalidate_mindmap_payload(mind_map_id):
+    get_payload_cache().delete(mindmap_payload_key(mind_map_id))
@@ -0,0 +1,111 @@
+import math
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+
+class SpatialGrid:
+    """Uniform grid over node boxes, indexed lazily around the queried area.
+
+    Only nodes overlapping the covered region are inserted; the region grows
+    (with a margin) whenever a query falls outside it. Nodes outside the
+    region are never moved by callers, so every node that can overlap a
+    queried box is always indexed.
+    """
+
+    def __init__(self, nodes: Sequence, cell_size: float, margin: float = None):
+        self.nodes = nodes
+        self.cell_size = cell_size
+        self.margin = cell_size * 4 if margin is None else margin
+        self._cells: Dict[Tuple[int, int], Set[int]] = {}
+        self._region: Optional[Tuple[float, float, float, float]] = None
+
+    @staticmethod
+    def bounds(nodes) -> Tuple[float, float, float, float]:
+        boxes = [SpatialGrid._box(node) for node in nodes]
+        return (
+            min(box[0] for box in boxes),
+            min(box[1] for box in boxes),
+            max(box[2] for box in boxes),
+            max(box[3] for box in boxes),
+        )
+
+    @staticmethod
+    def _box(node) -> Tuple[float, float, float, float]:
+        x = node["position"]["x"]
+        y = node["position"]["y"]
+        return x, y, x + node["width"], y + node["height"]
+
+    @staticmethod
+    def _overlaps(box, region) -> bool:
+        return (
+            region is not None
+            and box[0] <= region[2]
+            and box[2] >= region[0]
+            and box[1] <= region[3]
+            and box[3] >= region[1]
+        )
+
+    def cell_keys(self, node) -> List[Tuple[int, int]]:
+        size = self.cell_size
+        x0, y0, x1, y1 = self._box(node)
+        cx0, cx1 = math.floor(x0 / size), math.floor(x1 / size)
+        cy0, cy1 = math.floor(y0 / size), math.floor(y1 / size)
+        if cx0 == cx1 and cy0 == cy1:
+            return [(cx0, cy0)]
+        return [(cx, cy) for cx in range(cx0, cx1 + 1) for cy in range(cy0, cy1 + 1)]
+
+    def insert(self, index: int, node):
+        cells = self._cells
+        for key in self.cell_keys(node):
+            cell = cells.get(key)
+            if cell is None:
+                cells[key] = {index}
+            else:
+                cell.add(index)
+
+    def move(self, index: int, old_keys: List[Tuple[int, int]], node):
+        for key in old_keys:
+            cell = self._cells.get(key)
+            if cell is not None:
+                cell.discard(index)
+                if not cell:
+                    del self._cells[key]
+        self.insert(index, node)
+
+    def cover(self, box):
+        old_region = self._region
+        margin = self.margin
+        region = (box[0] - margin, box[1] - margin, box[2] + margin, box[3] + margin)
+        if old_region is not None:
+            region = (
+                min(region[0], old_region[0]),
+                min(region[1], old_region[1]),
+                max(region[2], old_region[2]),
+                max(region[3], old_region[3]),
+            )
+
+        for index, node in enumerate(self.nodes):
+            node_box = self._box(node)
+            if self._overlaps(node_box, region) and not self._overlaps(
+                node_box, old_region
+            ):
+                self.insert(index, node)
+        self._region = region
+
+    def query(self, node) -> Set[int]:
+        box = self._box(node)
+        region = self._region
+        if (
+            region is None
+            or box[0] < region[0]
+            or box[1] < region[1]
+            or box[2] > region[2]
+            or box[3] > region[3]
+        ):
+            self.cover(box)
+
+        found = set()
+        for key in self.cell_keys(node):
+            cell = self._cells.get(key)
+            if cell:
+                found.update(cell)
+        return found
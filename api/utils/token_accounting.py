@@ -0,0 +1,98 @@
+import logging
+import threading
+import time
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional
+
+import tiktoken
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=None)
+def _encoding_name(model: Optional[str]) -> str:
+    try:
+        return tiktoken.encoding_name_for_model(model or "")
+    except KeyError:
+        return settings.TOKEN_ACCOUNTING["FALLBACK_ENCODING"]
+
+
+_encodings: Dict[str, tiktoken.Encoding] = {}
+_retry_at: Dict[str, float] = {}
+_lock = threading.Lock()
+
+
+def _load_encoding(name: str) -> Optional[tiktoken.Encoding]:
+    # Only successful loads are kept. After a failure callers use the estimate
+    # until RETRY_AFTER has passed, then the next one tries again; the others
+    # keep estimating meanwhile rather than waiting on the download.
+    encoding = _encodings.get(name)
+    if encoding is not None:
+        return encoding
+    with _lock:
+        if name in _encodings:
+            return _encodings[name]
+        now = time.monotonic()
+        if now < _retry_at.get(name, 0):
+            return None
+        _retry_at[name] = now + settings.TOKEN_ACCOUNTING["RETRY_AFTER"]
+    try:
+        encoding = tiktoken.get_encoding(name)
+    except Exception as e:
+        logger.warning("Could not load tiktoken encoding %s: %s", name, e)
+        return None
+    _encodings[name] = encoding
+    return encoding
+
+
+def get_encoding(model: Optional[str]) -> Optional[tiktoken.Encoding]:
+    return _load_encoding(_encoding_name(model))
+
+
+def count_text_tokens(model: Optional[str], text: str) -> int:
+    if not text:
+        return 0
+    encoding = get_encoding(model)
+    if encoding is None:
+        return (len(text) + 3) // 4
+    return len(encoding.encode(text))
+
+
+def count_prompt_tokens(model: Optional[str], messages: List[Dict[str, str]]) -> int:
+    num_tokens = 0
+    for message in messages:
+        num_tokens += 4
+        for key, value in message.items():
+            num_tokens += count_text_tokens(model, value)
+            if key == "name":
+                num_tokens -= 1
+    num_tokens += 2
+    return num_tokens
+
+
+def build_usage(
+    model: Optional[str],
+    messages: List[Dict[str, str]],
+    completion: str,
+    stream_usage: Any = None,
+) -> Dict[str, int]:
+    if stream_usage is not None:
+        prompt_tokens = stream_usage.prompt_tokens
+        completion_tokens = stream_usage.completion_tokens
+    else:
+        prompt_tokens = count_prompt_tokens(model, messages)
+        completion_tokens = count_text_tokens(model, completion)
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+    }
+
+
+def prewarm_encodings(models: Iterable[str]):
+    def load():
+        for model in models:
+            get_encoding(model)
+
+    threading.Thread(target=load, name="tiktoken-prewarm", daemon=True).start()
@@ -0,0 +1,207 @@
+import math
+from typing import Dict, Hashable, List, Tuple
+
+Children = Dict[Hashable, List[Hashable]]
+Positions = Dict[Hashable, Tuple[float, float]]
+
+
+def _post_order(children: Children, root) -> List:
+    order = []
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        order.append(node)
+        stack.extend(children.get(node, []))
+    order.reverse()
+    return order
+
+
+def radial_layout(children: Children, root, level_spacing: float = 200) -> Positions:
+    leaves = {}
+    for node in _post_order(children, root):
+        kids = children.get(node, [])
+        leaves[node] = sum(leaves[kid] for kid in kids) if kids else 1
+
+    positions = {root: (0.0, 0.0)}
+    stack = [(root, 0, 0.0, 2 * math.pi)]
+    while stack:
+        node, depth, start, wedge = stack.pop()
+        kids = children.get(node, [])
+        total = leaves[node]
+        for kid in kids:
+            kid_wedge = wedge * leaves[kid] / total
+            angle = start + kid_wedge / 2
+            radius = (depth + 1) * level_spacing
+            positions[kid] = (radius * math.cos(angle), radius * math.sin(angle))
+            stack.append((kid, depth + 1, start, kid_wedge))
+            start += kid_wedge
+    return positions
+
+
+class _TreeNode:
+    __slots__ = (
+        "key",
+        "parent",
+        "children",
+        "number",
+        "x",
+        "mod",
+        "shift",
+        "change",
+        "thread",
+        "ancestor",
+    )
+
+    def __init__(self, key, parent, number):
+        self.key = key
+        self.parent = parent
+        self.children = []
+        self.number = number
+        self.x = 0.0
+        self.mod = 0.0
+        self.shift = 0.0
+        self.change = 0.0
+        self.thread = None
+        self.ancestor = self
+
+    def left(self):
+        return self.thread or (self.children[0] if self.children else None)
+
+    def right(self):
+        return self.thread or (self.children[-1] if self.children else None)
+
+    def left_brother(self):
+        if self.parent is None or self.number == 1:
+            return None
+        return self.parent.children[self.number - 2]
+
+    def leftmost_sibling(self):
+        if self.parent is None or self.number == 1:
+            return None
+        return self.parent.children[0]
+
+
+def _build_tree(children: Children, root) -> List[_TreeNode]:
+    root_node = _TreeNode(root, None, 1)
+    nodes = []
+    stack = [root_node]
+    while stack:
+        node = stack.pop()
+        nodes.append(node)
+        for number, key in enumerate(children.get(node.key, []), start=1):
+            child = _TreeNode(key, node, number)
+            node.children.append(child)
+            stack.append(child)
+    # Reversed, this is a left-to-right post-order.
+    return nodes
+
+
+def _move_subtree(left, right, shift):
+    subtrees = right.number - left.number
+    right.change -= shift / subtrees
+    right.shift += shift
+    left.change += shift / subtrees
+    right.x += shift
+    right.mod += shift
+
+
+def _execute_shifts(node):
+    shift = change = 0.0
+    for child in reversed(node.children):
+        child.x += shift
+        child.mod += shift
+        change += child.change
+        shift += child.shift + change
+
+
+def _apportion(node, default_ancestor, distance):
+    brother = node.left_brother()
+    if brother is None:
+        return default_ancestor
+
+    inner_right = outer_right = node
+    inner_left = brother
+    outer_left = node.leftmost_sibling()
+    shift_inner_right = shift_outer_right = node.mod
+    shift_inner_left = inner_left.mod
+    shift_outer_left = outer_left.mod
+
+    while inner_left.right() and inner_right.left():
+        inner_left = inner_left.right()
+        inner_right = inner_right.left()
+        outer_left = outer_left.left()
+        outer_right = outer_right.right()
+        outer_right.ancestor = node
+        shift = (
+            inner_left.x + shift_inner_left - (inner_right.x + shift_inner_right)
+        ) + distance
+        if shift > 0:
+            ancestor = (
+                inner_left.ancestor
+                if inner_left.ancestor.parent is node.parent
+                else default_ancestor
+            )
+            _move_subtree(ancestor, node, shift)
+            shift_inner_right += shift
+            shift_outer_right += shift
+        shift_inner_left += inner_left.mod
+        shift_inner_right += inner_right.mod
+        shift_outer_left += outer_left.mod
+        shift_outer_right += outer_right.mod
+
+    if inner_left.right() and not outer_right.right():
+        outer_right.thread = inner_left.right()
+        outer_right.mod += shift_inner_left - shift_outer_right
+    else:
+        if inner_right.left() and not outer_left.left():
+            outer_left.thread = inner_right.left()
+            outer_left.mod += shift_inner_right - shift_outer_left
+        default_ancestor = node
+    return default_ancestor
+
+
+def tidy_tree_layout(
+    children: Children,
+    root,
+    level_spacing: float = 250,
+    sibling_spacing: float = 60,
+) -> Positions:
+    # Buchheim, Jünger & Leipert's linear-time Reingold–Tilford variant, walked
+    # iteratively so deep maps do not hit the recursion limit. Depth runs along
+    # x (mind maps grow sideways) and siblings are spread along y.
+    nodes = _build_tree(children, root)
+    default_ancestors = {}
+
+    for node in reversed(nodes):
+        if node.children:
+            _execute_shifts(node)
+            midpoint = (node.children[0].x + node.children[-1].x) / 2
+            brother = node.left_brother()
+            if brother is not None:
+                node.x = brother.x + 1
+                node.mod = node.x - midpoint
+            else:
+                node.x = midpoint
+        else:
+            brother = node.left_brother()
+            node.x = brother.x + 1 if brother is not None else 0.0
+
+        if node.parent is not None:
+            parent = node.parent
+            default_ancestors[parent] = _apportion(
+                node, default_ancestors.get(parent, parent.children[0]), 1
+            )
+
+    positions = {}
+    stack = [(nodes[0], 0.0, 0)]
+    while stack:
+        node, modifier, depth = stack.pop()
+        positions[node.key] = (
+            depth * level_spacing,
+            (node.x + modifier) * sibling_spacing,
+        )
+        for child in node.children:
+            stack.append((child, modifier + node.mod, depth + 1))
+
+    root_y = positions[root][1]
+    return {key: (x, y - root_y) for key, (x, y) in positions.items()}
@@ -0,0 +1,33 @@
+import os
+import threading
+import time
+import uuid
+
+_lock = threading.Lock()
+_last = (0, 0)
+
+
+def uuid7() -> uuid.UUID:
+    # Time-ordered UUID (RFC 9562 version 7): a 48-bit millisecond timestamp,
+    # then a 12-bit counter that keeps ids from one process increasing within
+    # the same millisecond, then 62 random bits.
+    global _last
+    with _lock:
+        millis = time.time_ns() // 1_000_000
+        last_millis, counter = _last
+        if millis <= last_millis:
+            millis = last_millis
+            counter += 1
+            if counter > 0xFFF:
+                millis += 1
+                counter = 0
+        else:
+            counter = int.from_bytes(os.urandom(2), "big") & 0x7FF
+        _last = (millis, counter)
+
+    value = (millis & 0xFFFFFFFFFFFF) << 80
+    value |= 0x7 << 76
+    value |= counter << 64
+    value |= 0b10 << 62
+    value |= int.from_bytes(os.urandom(8), "big") & 0x3FFFFFFFFFFFFFFF
+    return uuid.UUID(int=value)
@@ -0,0 +1,16 @@
+import uuid
+
+from rest_framework import serializers
+
+
+class UUIDFieldSerializer(serializers.CharField):
+    # Accepts any UUID spelling and returns the canonical lowercase string,
+    # which is how node and mind map ids are stored and compared.
+    default_error_messages = {"invalid": "Must be a valid UUID."}
+
+    def to_internal_value(self, data):
+        value = super().to_internal_value(data)
+        try:
+            return str(uuid.UUID(value))
+        except ValueError:
+            self.fail("invalid")
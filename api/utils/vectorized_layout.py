@@ -0,0 +1,71 @@
+import numpy as np
+
+
+def resolve_collisions_vectorized(new_nodes, all_nodes, max_iterations=100):
+    # Positions and sizes live in contiguous arrays; each step tests one new node
+    # against every remaining node at once and resolves the first overlap, which
+    # keeps the visiting order (and results) of resolve_collisions_naive.
+    if not new_nodes:
+        return
+
+    xs = np.array([node["position"]["x"] for node in all_nodes], dtype=np.float64)
+    ys = np.array([node["position"]["y"] for node in all_nodes], dtype=np.float64)
+    ws = np.array([node["width"] for node in all_nodes], dtype=np.float64)
+    hs = np.array([node["height"] for node in all_nodes], dtype=np.float64)
+    ids = np.array([node.get("id") for node in all_nodes], dtype=object)
+
+    indexes = {id(node): index for index, node in enumerate(all_nodes)}
+    new_indexes = [indexes[id(node)] for node in new_nodes]
+    other_ids = [ids != ids[index] for index in new_indexes]
+    right = xs + ws
+    bottom = ys + hs
+    moved = set()
+    iterations = 0
+
+    while iterations < max_iterations:
+        has_collision = False
+
+        for i, k in enumerate(new_indexes):
+            start = 0
+
+            while True:
+                hits = np.flatnonzero(
+                    (xs[k] < right[start:])
+                    & (right[k] > xs[start:])
+                    & (ys[k] < bottom[start:])
+                    & (bottom[k] > ys[start:])
+                    & other_ids[i][start:]
+                )
+                if not hits.size:
+                    break
+
+                j = start + int(hits[0])
+                _resolve_pair(xs, ys, k, j, right, bottom)
+                right[[k, j]] = xs[[k, j]] + ws[[k, j]]
+                bottom[[k, j]] = ys[[k, j]] + hs[[k, j]]
+                moved.update((k, j))
+                has_collision = True
+                start = j + 1
+
+        if not has_collision:
+            break
+        iterations += 1
+
+    for index in moved:
+        position = all_nodes[index]["position"]
+        position["x"] = float(xs[index])
+        position["y"] = float(ys[index])
+
+
+def _resolve_pair(xs, ys, a, b, right, bottom):
+    overlap_x = min(right[a] - xs[b], right[b] - xs[a])
+    overlap_y = min(bottom[a] - ys[b], bottom[b] - ys[a])
+
+    if overlap_x < overlap_y:
+        shift = overlap_x / 2 if xs[a] < xs[b] else -overlap_x / 2
+        xs[a] -= shift
+        xs[b] += shift
+    else:
+        shift = overlap_y / 2 if ys[a] < ys[b] else -overlap_y / 2
+        ys[a] -= shift
+        ys[b] += shift
@@ -1,5 +1,12 @@
 from .mindmap import MindMapViewSet
 from .node import NodeViewSet
+from .async_node import (
+    auto_generate_children,
+    auto_generate_children_batch,
+    auto_generate_note,
+)
+from .note_generation import NoteGenerationViewSet
 from .public_mindmap import PublicMindMapViewSet
 from .public_node import PublicNodeViewSet
 from .user import register_user, login_user, verify_ai_key
+from .generation import generation_stats
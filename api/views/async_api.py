@@ -0,0 +1,113 @@
+import functools
+from typing import Iterable, Iterator, Optional
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponseNotAllowed, JsonResponse, StreamingHttpResponse
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import exceptions
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+
+def async_api_view(
+    http_method_names: Iterable[str], permission_classes: Optional[Iterable] = None
+):
+    # DRF views are sync only, so async views build the DRF request themselves
+    # and run authentication, permission checks and body parsing in a thread.
+    # Like @api_view, other methods are refused before any of that runs.
+    allowed_methods = [method.upper() for method in http_method_names]
+    if permission_classes is None:
+        permission_classes = api_settings.DEFAULT_PERMISSION_CLASSES
+
+    def decorator(view):
+        @csrf_exempt
+        @functools.wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            if request.method not in allowed_methods:
+                return HttpResponseNotAllowed(allowed_methods)
+            drf_request = Request(
+                request,
+                parsers=[parser() for parser in api_settings.DEFAULT_PARSER_CLASSES],
+                authenticators=[
+                    auth() for auth in api_settings.DEFAULT_AUTHENTICATION_CLASSES
+                ],
+            )
+            try:
+                await sync_to_async(_check_request)(drf_request, permission_classes)
+                return await view(drf_request, *args, **kwargs)
+            except exceptions.APIException as exc:
+                return _exception_response(drf_request, exc)
+
+        return wrapper
+
+    return decorator
+
+
+def _check_request(request: Request, permission_classes):
+    for permission_class in permission_classes:
+        if not permission_class().has_permission(request, None):
+            if request.authenticators and not request.successful_authenticator:
+                raise exceptions.NotAuthenticated()
+            raise exceptions.PermissionDenied()
+    # Parse the body here too so views can read request.data without blocking.
+    request.data
+
+
+def _exception_response(request: Request, exc: exceptions.APIException):
+    detail = (
+        exc.detail if isinstance(exc.detail, (list, dict)) else {"detail": exc.detail}
+    )
+    response = JsonResponse(detail, status=exc.status_code, safe=False)
+    # Same as APIView: without a WWW-Authenticate header a 401 becomes a 403.
+    if isinstance(exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+        authenticators = request.authenticators
+        header = (
+            authenticators[0].authenticate_header(request) if authenticators else None
+        )
+        if header:
+            response["WWW-Authenticate"] = header
+        else:
+            response.status_code = exceptions.PermissionDenied.status_code
+    if getattr(exc, "wait", None):
+        response["Retry-After"] = str(int(exc.wait))
+    return response
+
+
+def event_stream_response(request, events) -> StreamingHttpResponse:
+    # Async iteration under ASGI, so waiting streams do not hold a thread; WSGI
+    # only streams sync iterators.
+    http_request = getattr(request, "_request", request)
+    if isinstance(http_request, ASGIRequest):
+        content = events.__aiter__()
+    else:
+        content = iter(events)
+    response = StreamingHttpResponse(content, content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+async def iterate_in_thread(chunks: Iterator):
+    # Pulls one chunk at a time from a sync iterator on the thread that owns
+    # the database connection, so an open cursor keeps working between chunks.
+    sentinel = object()
+    next_chunk = sync_to_async(next)
+    try:
+        while True:
+            chunk = await next_chunk(chunks, sentinel)
+            if chunk is sentinel:
+                return
+            yield chunk
+    finally:
+        if hasattr(chunks, "close"):
+            await sync_to_async(chunks.close)()
+
+
+def streaming_content(request, chunks: Iterator):
+    # Under ASGI Django reads a sync iterator into memory before sending any of
+    # it, so hand it an async one instead.
+    http_request = getattr(request, "_request", request)
+    if isinstance(http_request, ASGIRequest):
+        return iterate_in_thread(chunks)
+    return chunks
@@ -0,0 +1,134 @@
+import asyncio
+import os
+
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.http import JsonResponse
+from rest_framework import permissions, status
+from rest_framework.exceptions import NotFound, ValidationError
+
+from ..models import Node
+from ..services import NodeChildrenGenerator, NodeNoteGenerator
+from ..services.generation_runner import generation_runner
+from ..serializers import (
+    GeneratedChildrenSerializer,
+    AutoGenerateChildrenSerializer,
+    GeneratedChildrenBatchSerializer,
+    AutoGenerateChildrenBatchSerializer,
+    AutoGenerateNoteSerializer,
+)
+from .async_api import async_api_view, event_stream_response
+
+OPENAI_KEY = os.environ.get("OPENAI_KEY")
+AI_MODEL = os.environ.get("AI_MODEL")
+
+
+async def _get_owned_node(request, pk) -> Node:
+    try:
+        return (
+            await Node.objects.select_related("mind_map")
+            .defer("flow_data")
+            .aget(pk=pk, mind_map__user=request.user)
+        )
+    except (Node.DoesNotExist, DjangoValidationError):
+        raise NotFound()
+
+
+@async_api_view(["POST"], [permissions.IsAuthenticated])
+async def auto_generate_children(request, pk):
+    node = await _get_owned_node(request, pk)
+
+    serializer = AutoGenerateChildrenSerializer(data=request.data)
+    if not serializer.is_valid():
+        return JsonResponse(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    validated_data = serializer.validated_data
+    positions = validated_data.get("nodes_position")
+    ai_key = validated_data.get("ai_key")
+    ai_model = validated_data.get("ai_model")
+
+    children = await asyncio.wrap_future(
+        generation_runner.submit(
+            node.mind_map.user_id,
+            lambda: NodeChildrenGenerator.generate(
+                ai_model if ai_key and ai_model else AI_MODEL,
+                ai_key or OPENAI_KEY,
+                node,
+                positions,
+                force=validated_data["force"],
+            ),
+        )
+    )
+
+    response_serializer = GeneratedChildrenSerializer({"children": children})
+    return JsonResponse(response_serializer.data)
+
+
+@async_api_view(["POST"], [permissions.IsAuthenticated])
+async def auto_generate_children_batch(request):
+    serializer = AutoGenerateChildrenBatchSerializer(data=request.data)
+    if not serializer.is_valid():
+        return JsonResponse(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    validated_data = serializer.validated_data
+    node_ids = validated_data["node_ids"]
+    positions = validated_data.get("nodes_position")
+    ai_key = validated_data.get("ai_key")
+    ai_model = validated_data.get("ai_model")
+
+    found = {
+        node.id: node
+        async for node in Node.objects.select_related("mind_map")
+        .defer("flow_data")
+        .filter(pk__in=node_ids, mind_map__user=request.user)
+    }
+    missing = [node_id for node_id in node_ids if node_id not in found]
+    if missing:
+        raise NotFound(f"Nodes not found: {', '.join(missing)}")
+    nodes = [found[node_id] for node_id in node_ids]
+    if len({node.mind_map_id for node in nodes}) > 1:
+        raise ValidationError({"node_ids": ["Nodes must belong to one mind map."]})
+
+    result = await asyncio.wrap_future(
+        generation_runner.submit(
+            nodes[0].mind_map.user_id,
+            lambda: NodeChildrenGenerator.generate_batch(
+                ai_model if ai_key and ai_model else AI_MODEL,
+                ai_key or OPENAI_KEY,
+                nodes,
+                positions,
+                force=validated_data["force"],
+            ),
+        )
+    )
+
+    response_serializer = GeneratedChildrenBatchSerializer(result)
+    return JsonResponse(response_serializer.data)
+
+
+@async_api_view(["POST"], [permissions.IsAuthenticated])
+async def auto_generate_note(request, pk):
+    node = await _get_owned_node(request, pk)
+
+    serializer = AutoGenerateNoteSerializer(data=request.data)
+    if not serializer.is_valid():
+        return JsonResponse(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    validated_data = serializer.validated_data
+    instruction = validated_data.get("instruction")
+    ai_key = validated_data.get("ai_key")
+    ai_model = validated_data.get("ai_model")
+    args = (
+        node,
+        instruction,
+        ai_key or OPENAI_KEY,
+        ai_model if ai_key and ai_model else AI_MODEL,
+        validated_data["force"],
+    )
+
+    if validated_data["stream"]:
+        events = await sync_to_async(NodeNoteGenerator.stream)(*args)
+        return event_stream_response(request, events)
+
+    result = await sync_to_async(NodeNoteGenerator.generate)(*args)
+    return JsonResponse(result)
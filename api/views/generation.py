@@ -0,0 +1,12 @@
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+
+from ..services.generation_runner import generation_runner
+
+
+@api_view(["GET"])
+@permission_classes([IsAdminUser])
+def generation_stats(request):
+    return Response(generation_runner.stats(), status=status.HTTP_200_OK)
@@ -1,11 +1,17 @@
-from rest_framework import viewsets, permissions
+from rest_framework import viewsets, permissions, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
 from ..models import MindMap
+from ..services import ApplyMindMapOperations, LayoutMindMap
 from ..serializers import (
     MindMapSerializer,
     MindMapCreateSerializer,
     MindMapUpdateSerializer,
     MindMapListSerializer,
+    MindMapOperationsSerializer,
+    MindMapLayoutSerializer,
 )
+from .mixins import ProjectDataRetrieveMixin
 
 
 class IsMindMapOwner(permissions.BasePermission):
@@ -13,7 +19,7 @@ class IsMindMapOwner(permissions.BasePermission):
         return obj.user == request.user
 
 
-class MindMapViewSet(viewsets.ModelViewSet):
+class MindMapViewSet(ProjectDataRetrieveMixin, viewsets.ModelViewSet):
     permission_classes = [permissions.IsAuthenticated, IsMindMapOwner]
 
     def get_queryset(self):
@@ -27,3 +33,37 @@ class MindMapViewSet(viewsets.ModelViewSet):
         elif self.action in ["update", "partial_update"]:
             return MindMapUpdateSerializer
         return MindMapSerializer
+
+    @action(detail=True, methods=["patch"])
+    def operations(self, request, pk=None):
+        mind_map = self.get_object()
+
+        serializer = MindMapOperationsSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        validated_data = serializer.validated_data
+        result = ApplyMindMapOperations.run(
+            mind_map,
+            validated_data["operations"],
+            validated_data.get("base_version"),
+        )
+        return Response(result)
+
+    @action(detail=True, methods=["post"])
+    def layout(self, request, pk=None):
+        mind_map = self.get_object()
+
+        serializer = MindMapLayoutSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        validated_data = serializer.validated_data
+        result = LayoutMindMap.run(
+            mind_map,
+            validated_data["algorithm"],
+            validated_data.get("root"),
+            validated_data.get("level_spacing"),
+            validated_data.get("sibling_spacing"),
+        )
+        return Response(result)
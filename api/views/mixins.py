@@ -0,0 +1,49 @@
+from django.conf import settings
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+
+from ..serializers import MindMapSummarySerializer
+from ..services import MindMapProjectData
+from ..utils.payload_cache import get_mindmap_payload, set_mindmap_payload
+from .async_api import streaming_content
+
+
+class ProjectDataRetrieveMixin:
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        not_modified = get_conditional_response(request, etag=instance.etag)
+        if not_modified is not None:
+            return not_modified
+
+        payload = get_mindmap_payload(instance)
+        if payload is not None:
+            response = HttpResponse(payload, content_type="application/json")
+        else:
+            head = MindMapSummarySerializer(
+                instance, context=self.get_serializer_context()
+            ).data
+            chunks = self._cache_payload(
+                instance, MindMapProjectData.iter_document(instance, head)
+            )
+            response = StreamingHttpResponse(
+                streaming_content(request, chunks), content_type="application/json"
+            )
+        response["ETag"] = instance.etag
+        return response
+
+    @staticmethod
+    def _cache_payload(instance, chunks):
+        max_bytes = settings.MINDMAP_PAYLOAD_CACHE["MAX_ITEM_BYTES"]
+        parts = []
+        size = 0
+        for chunk in chunks:
+            chunk = chunk.encode()
+            yield chunk
+            if parts is not None:
+                size += len(chunk)
+                if size <= max_bytes:
+                    parts.append(chunk)
+                else:
+                    parts = None
+        if parts is not None:
+            set_mindmap_payload(instance, b"".join(parts))
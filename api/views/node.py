@@ -1,22 +1,7 @@
-from rest_framework import viewsets, permissions, status
-from rest_framework.response import Response
-from rest_framework.decorators import action
-from django.http import JsonResponse
-import os
-import asyncio
+from rest_framework import viewsets, permissions
 
-from ..models import Node
-from ..services import NodeChildrenGenerator, NodeNoteGenerator
-from ..serializers import (
-    NodeSerializer,
-    NodeUpdateSerializer,
-    GeneratedChildrenSerializer,
-    AutoGenerateChildrenSerializer,
-    AutoGenerateNoteSerializer,
-)
-
-OPENAI_KEY = os.environ.get("OPENAI_KEY")
-AI_MODEL = os.environ.get("AI_MODEL")
+from ..models import MindMap, Node
+from ..serializers import NodeSerializer, NodeUpdateSerializer
 
 
 class IsNodeOwner(permissions.BasePermission):
@@ -36,47 +21,19 @@ class NodeViewSet(viewsets.ModelViewSet):
             return NodeUpdateSerializer
         return NodeSerializer
 
-    @action(detail=True, methods=["post"])
-    def auto_generate_note(self, request, pk=None):
-        node = self.get_object()
-
-        serializer = AutoGenerateNoteSerializer(data=request.data)
-        if not serializer.is_valid():
-            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
-
-        validated_data = serializer.validated_data
-        instruction = validated_data.get("instruction")
-        ai_key = validated_data.get("ai_key")
-        ai_model = validated_data.get("ai_model")
-        result = NodeNoteGenerator.generate(
-            node,
-            instruction,
-            ai_key or OPENAI_KEY,
-            ai_model if ai_key and ai_model else AI_MODEL,
-        )
-        return JsonResponse(result)
-
-    @action(detail=True, methods=["post"])
-    def auto_generate_children(self, request, pk=None):
-        node = self.get_object()
-
-        serializer = AutoGenerateChildrenSerializer(data=request.data)
-        if not serializer.is_valid():
-            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
-
-        validated_data = serializer.validated_data
-        positions = validated_data.get("nodes_position")
-        ai_key = validated_data["ai_key"]
-        ai_model = validated_data["ai_model"]
-
-        children = asyncio.run(
-            NodeChildrenGenerator.generate(
-                ai_model if ai_key and ai_model else AI_MODEL,
-                ai_key or OPENAI_KEY,
-                node,
-                positions,
+    def perform_create(self, serializer):
+        node = serializer.save()
+        if node.parent_id is None:
+            MindMap.objects.filter(pk=node.mind_map_id, root_node__isnull=True).update(
+                root_node=node
             )
-        )
+        MindMap.bump_version(node.mind_map_id)
+
+    def perform_update(self, serializer):
+        node = serializer.save()
+        MindMap.bump_version(node.mind_map_id)
 
-        response_serializer = GeneratedChildrenSerializer({"children": children})
-        return Response(response_serializer.data)
+    def perform_destroy(self, instance):
+        mind_map_id = instance.mind_map_id
+        instance.delete()
+        MindMap.bump_version(mind_map_id)
@@ -0,0 +1,16 @@
+from rest_framework import viewsets, permissions
+
+from ..models import NoteGeneration
+from ..serializers import NoteGenerationSerializer
+
+
+class NoteGenerationViewSet(viewsets.ReadOnlyModelViewSet):
+    permission_classes = [permissions.IsAuthenticated]
+    serializer_class = NoteGenerationSerializer
+
+    def get_queryset(self):
+        return (
+            NoteGeneration.objects.filter(user=self.request.user)
+            .select_related("node")
+            .order_by("-created_at")
+        )
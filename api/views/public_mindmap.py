@@ -1,6 +1,7 @@
 from rest_framework import viewsets, permissions
 from ..models import MindMap
 from ..serializers import MindMapSerializer
+from .mixins import ProjectDataRetrieveMixin
 
 
 class PublicMindMapPermission(permissions.BasePermission):
@@ -11,7 +12,7 @@ class PublicMindMapPermission(permissions.BasePermission):
         return not obj.is_private
 
 
-class PublicMindMapViewSet(viewsets.ReadOnlyModelViewSet):
+class PublicMindMapViewSet(ProjectDataRetrieveMixin, viewsets.ReadOnlyModelViewSet):
     permission_classes = [PublicMindMapPermission]
     queryset = MindMap.objects.filter(is_private=False)
     serializer_class = MindMapSerializer
@@ -1,4 +1,4 @@
-from openai import OpenAI
+import asyncio
 import os
 
 from django.contrib.auth.models import User
@@ -7,8 +7,12 @@ from rest_framework.response import Response
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny
 from django.contrib.auth import authenticate
+from django.http import JsonResponse
 from rest_framework_simplejwt.tokens import RefreshToken
 from ..serializers import UserSerializer
+from ..services.generation_runner import generation_runner
+from ..utils.openai_clients import openai_clients
+from .async_api import async_api_view
 
 AI_MODEL = os.environ.get("AI_MODEL")
 
@@ -65,21 +69,28 @@ def login_user(request):
         )
 
 
-@api_view(["POST"])
-def verify_ai_key(request):
+@async_api_view(["POST"])
+async def verify_ai_key(request):
     api_key = request.data.get("key")
     model = request.data.get("model")
-    client = OpenAI(api_key=api_key)
     model = model if api_key and model else AI_MODEL
 
-    completion = client.chat.completions.create(
-        model=model, messages=[{"role": "user", "content": "Hello"}]
+    async def complete():
+        client = openai_clients.get_async(api_key)
+        return await client.chat.completions.create(
+            model=model, messages=[{"role": "user", "content": "Hello"}]
+        )
+
+    completion = await asyncio.wrap_future(
+        generation_runner.submit(request.user.id, complete)
     )
 
     response = completion.choices[0].message.content
     if response is not None:
-        return Response(
+        return JsonResponse(
             {"message": "User created successfully"}, status=status.HTTP_200_OK
         )
     else:
-        return Response({"error": "Invalid key"}, status=status.HTTP_400_BAD_REQUEST)
+        return JsonResponse(
+            {"error": "Invalid key"}, status=status.HTTP_400_BAD_REQUEST
+        )
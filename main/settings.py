@@ -77,6 +77,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = "main.wsgi.application"
+ASGI_APPLICATION = "main.asgi.application"
 
 
 # Database
@@ -94,6 +95,112 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+
+CACHES = {
+    "default": {
+        "BACKEND": os.environ.get(
+            "CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.environ.get("CACHE_LOCATION", ""),
+    }
+}
+
+# Rendered mind map payloads: "lru" keeps them in a per-process LRU bounded by
+# MAX_BYTES, "django" stores them in the CACHES entry named by ALIAS.
+MINDMAP_PAYLOAD_CACHE = {
+    "BACKEND": os.environ.get("MINDMAP_PAYLOAD_CACHE_BACKEND", "lru"),
+    "ALIAS": os.environ.get("MINDMAP_PAYLOAD_CACHE_ALIAS", "default"),
+    "MAX_BYTES": int(
+        os.environ.get("MINDMAP_PAYLOAD_CACHE_MAX_BYTES", 64 * 1024 * 1024)
+    ),
+    "MAX_ITEM_BYTES": int(
+        os.environ.get("MINDMAP_PAYLOAD_CACHE_MAX_ITEM_BYTES", 8 * 1024 * 1024)
+    ),
+    "TIMEOUT": None,
+}
+
+
+# Collision solver used when placing generated children: "grid" (spatial
+# index), "numpy" (vectorized) or "naive" (reference implementation).
+LAYOUT_SOLVER = os.environ.get("LAYOUT_SOLVER", "grid")
+
+
+# AI generation jobs run on one asyncio loop per worker process.
+GENERATION_RUNNER = {
+    "MAX_CONCURRENCY": int(os.environ.get("GENERATION_MAX_CONCURRENCY", 100)),
+    "MAX_QUEUE_SIZE": int(os.environ.get("GENERATION_MAX_QUEUE_SIZE", 500)),
+    "MAX_PER_USER": int(os.environ.get("GENERATION_MAX_PER_USER", 3)),
+    "DRAIN_TIMEOUT": float(os.environ.get("GENERATION_DRAIN_TIMEOUT", 30)),
+    # Model calls a single batch request may have in flight at once.
+    "BATCH_CONCURRENCY": int(os.environ.get("GENERATION_BATCH_CONCURRENCY", 8)),
+    "BATCH_MAX_NODES": int(os.environ.get("GENERATION_BATCH_MAX_NODES", 50)),
+}
+
+
+# Streamed note chunks are coalesced before being relayed to SOCKET_URL. MODE
+# "full" resends the whole note on every update, "delta" only the new text.
+SOCKET_RELAY = {
+    "MODE": os.environ.get("SOCKET_RELAY_MODE", "full"),
+    "FLUSH_INTERVAL_MS": int(os.environ.get("SOCKET_RELAY_FLUSH_INTERVAL_MS", 100)),
+    "MAX_BATCH_BYTES": int(os.environ.get("SOCKET_RELAY_MAX_BATCH_BYTES", 1024)),
+    "TIMEOUT": float(os.environ.get("SOCKET_RELAY_TIMEOUT", 5)),
+    "MAX_CONNECTIONS": int(os.environ.get("SOCKET_RELAY_MAX_CONNECTIONS", 20)),
+}
+
+
+# Token counting only falls back to tiktoken when the stream reports no usage.
+# Encodings for PREWARM_MODELS are loaded in the background at startup; a
+# failed load is retried after RETRY_AFTER seconds.
+TOKEN_ACCOUNTING = {
+    "FALLBACK_ENCODING": os.environ.get("TOKEN_FALLBACK_ENCODING", "o200k_base"),
+    "PREWARM_MODELS": [
+        model
+        for model in os.environ.get(
+            "TOKEN_PREWARM_MODELS", os.environ.get("AI_MODEL", "")
+        ).split(",")
+        if model
+    ],
+    "RETRY_AFTER": int(os.environ.get("TOKEN_ENCODING_RETRY_AFTER", 60)),
+}
+
+
+# Opt-in cache of model output keyed on model + normalized prompt, so repeated
+# generations with unchanged context skip the model ("force" bypasses it).
+GENERATION_CACHE = {
+    "ENABLED": os.environ.get("GENERATION_CACHE_ENABLED", "false").lower() == "true",
+    "BACKEND": os.environ.get("GENERATION_CACHE_BACKEND", "lru"),
+    "ALIAS": os.environ.get("GENERATION_CACHE_ALIAS", "default"),
+    "MAX_ENTRIES": int(os.environ.get("GENERATION_CACHE_MAX_ENTRIES", 1000)),
+    "TTL": int(os.environ.get("GENERATION_CACHE_TTL", 3600)),
+}
+
+
+# Prompts describe the map around the node being expanded: its path from the
+# root, siblings and DESCENDANT_DEPTH levels of descendants, up to TOKEN_BUDGET.
+PROMPT_CONTEXT = {
+    "TOKEN_BUDGET": int(os.environ.get("PROMPT_CONTEXT_TOKEN_BUDGET", 2000)),
+    "DESCENDANT_DEPTH": int(os.environ.get("PROMPT_CONTEXT_DESCENDANT_DEPTH", 2)),
+}
+
+
+# Shared OpenAI clients, one per (API key, base URL), evicting the least
+# recently used beyond MAX_CLIENTS. Pool limits and timeouts apply per client.
+OPENAI_CLIENTS = {
+    "MAX_CLIENTS": int(os.environ.get("OPENAI_MAX_CLIENTS", 256)),
+    "MAX_CONNECTIONS": int(os.environ.get("OPENAI_MAX_CONNECTIONS", 20)),
+    "MAX_KEEPALIVE_CONNECTIONS": int(
+        os.environ.get("OPENAI_MAX_KEEPALIVE_CONNECTIONS", 10)
+    ),
+    "KEEPALIVE_EXPIRY": float(os.environ.get("OPENAI_KEEPALIVE_EXPIRY", 30)),
+    "TIMEOUT": float(os.environ.get("OPENAI_TIMEOUT", 60)),
+    "CONNECT_TIMEOUT": float(os.environ.get("OPENAI_CONNECT_TIMEOUT", 5)),
+    "MAX_RETRIES": int(os.environ.get("OPENAI_MAX_RETRIES", 2)),
+    "CLOSE_DELAY": float(os.environ.get("OPENAI_CLIENT_CLOSE_DELAY", 600)),
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 